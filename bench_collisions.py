@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Collision Benchmark for KeyBlaster
+
+Times functions.check_collisions (grid broadphase) against the original
+all-pairs version with 10, 100 and 1000 missiles and explosions, and
+checks that both destroy the same missiles and cities with the same score.
+
+Usage:
+  python bench_collisions.py [repeats]
+"""
+
+import random
+import sys
+import time
+from config import *
+from functions import check_collisions, distance
+from missile import Missile
+from explosion import Explosion
+from city import City
+
+
+# the original all-pairs check_collisions, kept for comparison
+def check_collisions_reference(missile_list, explosion_list, city_list, removed_missiles = None):
+    score = 0
+
+    for explosion in explosion_list:
+        for missile in missile_list[:]:
+            if explosion.get_radius() > distance(explosion.get_center(), missile.get_pos()):
+                score += missile.get_points() * explosion.get_points_multiplier()
+                missile_list.remove(missile)
+                if removed_missiles is not None:
+                    removed_missiles.append(missile)
+        for city in city_list[:]:
+            if explosion.get_radius() > distance(explosion.get_center(), city.get_pos()):
+                city.set_destroyed(True)
+                city_list.remove(city)
+
+    return score
+
+
+def make_scene(count, rng):
+    """count missiles and count explosions scattered over the play area"""
+    missiles = []
+    for _ in range(count):
+        missile = Missile((rng.randint(0, SCREENSIZE[0]), SKY_LEVEL),
+                          (rng.randint(0, SCREENSIZE[0]), SCREENSIZE[1] - GROUND_LEVEL))
+        missile.pos = (rng.randint(0, SCREENSIZE[0]), rng.randint(SKY_LEVEL, SCREENSIZE[1]))
+        missiles.append(missile)
+    explosions = []
+    for _ in range(count):
+        explosion = Explosion((rng.randint(0, SCREENSIZE[0]), rng.randint(SKY_LEVEL, SCREENSIZE[1])),
+                              rng.choice((0, 1)), NUKE_RADIUS)
+        explosion.radius = rng.randint(0, NUKE_RADIUS)
+        explosions.append(explosion)
+    return missiles, explosions
+
+
+def run(function, missiles, explosions, repeats):
+    """Best time of repeats calls on fresh copies of the scene, plus the last result"""
+    best = None
+    for _ in range(repeats):
+        missile_list = list(missiles)
+        city_list = [City(number, 7) for number in range(1, 8)]
+        removed = []
+        started = time.perf_counter()
+        score = function(missile_list, explosions, city_list, removed)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    result = (score, [id(m) for m in missile_list], [id(m) for m in removed], [c.get_pos() for c in city_list])
+    return best, result
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(1)
+    print(f"{'entities':>8}  {'all-pairs':>12}  {'grid':>12}  {'speed-up':>8}")
+    for count in (10, 100, 1000):
+        missiles, explosions = make_scene(count, rng)
+        old_time, old_result = run(check_collisions_reference, missiles, explosions, repeats)
+        new_time, new_result = run(check_collisions, missiles, explosions, repeats)
+        if old_result != new_result:
+            print(f"{count:>8}  results differ!")
+            continue
+        print(f"{count:>8}  {old_time * 1000:>10.3f}ms  {new_time * 1000:>10.3f}ms  {old_time / new_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Word Index Compiler for KeyBlaster
+
+Turns a plain word list (one word per line) into the compact binary index
+the game memory-maps at runtime. Words are bucketed by length, keyboard
+rows used and 2-letter prefix.
+
+Usage:
+  python build_word_index.py <words.txt> [index.kbw]   # default output: WORD_INDEX_FILE
+"""
+
+import os
+import sys
+import time
+from config import WORD_INDEX_FILE
+from wordindex import compile_word_index, WordIndex
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python build_word_index.py <words.txt> [index.kbw]")
+        print(f"\nWrites to {WORD_INDEX_FILE} unless an output file is given.")
+        print("Only words typed with the letter keys are kept; others are skipped.")
+        return
+
+    source = sys.argv[1]
+    output = sys.argv[2] if len(sys.argv) > 2 else WORD_INDEX_FILE
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+
+    started = time.time()
+    with open(source, encoding='utf-8', errors='ignore') as f:
+        kept, skipped = compile_word_index(f, output)
+
+    index = WordIndex(output)
+    lengths = {}
+    for length, rows, prefix, start, count in index.buckets():
+        lengths[length] = lengths.get(length, 0) + count
+    bucket_count = index.bucket_count
+    index.close()
+
+    print(f"Compiled {kept:,} words ({skipped:,} skipped) into {output}")
+    print(f"  Size: {os.path.getsize(output):,} bytes  Buckets: {bucket_count:,}  Time: {time.time() - started:.2f}s")
+    print("  Words by length: " + ", ".join(f"{length}: {count:,}" for length, count in sorted(lengths.items())))
+
+
+if __name__ == '__main__':
+    main()
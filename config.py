@@ -15,6 +15,7 @@ pygame.display.set_mode((infoObject.current_w, infoObject.current_h))
 FPS                     = 30
 TITLE                   = "KeyBlaster"
 SHOW_MOUSE              = False  # Typing game - no mouse needed
+DEBUG_STATS             = False  # True: print label cache, entity pool and frame time stats on quit
 current_game_state      = 0
 GAME_STATE_SPLASH       = 10
 GAME_STATE_MENU         = 20
@@ -43,7 +44,48 @@ INTERCEPT_EXPLOSION     = (255, 255, 255)       # ffffff
 pygame.font.init()
 game_font = pygame.font.Font('data/fnt/PressStart2P-Regular.ttf', 16)
 
+# rendered label surface cache (see labelcache.py)
+LABEL_CACHE_MAX_ENTRIES = 512
+LABEL_CACHE_MAX_BYTES   = 4 * 1024 * 1024   # 4 MB of pixel data
+TYPED_LABEL             = (0, 255, 0)       # green for the typed part of a word
+
 
 # gameplay settings
 INTERCEPT_RADIUS        = 35
 NUKE_RADIUS             = 50
+STRICT_TYPING           = False     # True: words must be typed in order (competitive mode)
+TURBO_SPEED             = 10        # simulation steps per rendered frame while turbo is on
+TURBO_FRAME_BUDGET      = 0.8       # share of each frame's time turbo substeps may use
+MAX_CATCHUP_STEPS       = 4         # steps a late frame may run to catch up; beyond that the game slows down
+MAX_FRAME_GAP           = 0.25      # seconds; longer gaps (pause, level prompt) are not caught up
+
+# timers in seconds (see gameclock.py)
+MULTIPLIER_DURATION     = 10.0      # 2x points after a powerup (real time)
+TURBO_DURATION          = 0.5       # temporary turbo after a key that is on no label (real time)
+AIM_DURATION            = 0.25      # turret aiming before a destruction (game time)
+LASER_DURATION          = 0.33      # laser beam on screen (game time)
+HUD_FLASH_PERIOD        = 2.0       # multiplier text pulse (real time)
+POWERUP_SPAWN_MIN       = 20        # seconds of game time between powerups, at least ...
+POWERUP_SPAWN_MAX       = 30        # ... and at most
+
+# keyboard rows used for key labels and word classification
+TOP_ROW_KEYS            = "qwertyuiop"
+HOME_ROW_KEYS           = "asdfghjkl"
+BOTTOM_ROW_KEYS         = "zxcvbnm"
+
+# optional compiled word index (see build_word_index.py); built-in word lists are used if missing
+WORD_INDEX_FILE         = 'data/words/words.kbw'
+ERGONOMIC_DIFFICULTY    = False     # True: pick words by keyboard-ergonomics score band (ergonomics.py)
+
+# replays
+STATE_HASH_INTERVAL     = 30        # steps between state hashes in replays (playback.py checks them)
+SNAPSHOT_INTERVAL       = 30        # steps between game_state snapshots in replays
+KEYFRAME_INTERVAL       = 10        # every Nth snapshot is complete (a keyframe); the others hold only changes
+SEEK_INTERVAL           = 6         # every Nth keyframe of a .kbr replay is a seek point (each one costs compression)
+REPLAY_JOURNAL_BATCH    = 64        # replay events buffered before they are appended to the journal file
+REPLAY_QUEUE_SIZE       = 16        # batches waiting for the replay writer thread before new ones are held back
+REPLAY_MAX_PENDING      = 20000     # events held back before recording waits for the writer
+REPLAY_SUMMARY_TAIL     = 200       # most recent keystrokes and word matches kept in a replay's debug summary
+REPLAY_EXTENSION        = '.kbr'    # new replays: '.kbr' compact binary (replayformat.py) or '.jsonl' JSON lines
+# per-directory list of replays with duration, event count, final score and highest level, kept up to date by the recorder
+REPLAY_CATALOG          = 'catalog.idx'
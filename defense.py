@@ -1,8 +1,9 @@
 import pygame
-import random
 import math
 from config import *
 from functions import *
+from missile import missile_pool
+from gameclock import timer_done
 
 class Defense():
     def __init__(self):
@@ -21,13 +22,13 @@ class Defense():
         # New targeting system
         self.current_target = None                           # current target object (missile/powerup)
         self.is_aiming = False                               # is turret currently aiming at target
-        self.aiming_timer = 0                                # timer for aiming animation
-        self.aiming_duration = 8                             # frames to complete aiming (0.27 seconds at 30 FPS)
+        self.aiming_timer = 0                                # seconds spent aiming
+        self.aiming_duration = AIM_DURATION                  # seconds to complete aiming
         
         # Laser beam system
         self.laser_active = False                            # is laser beam currently visible
-        self.laser_timer = 0                                 # timer for laser beam duration
-        self.laser_duration = 10                             # frames to show laser (0.33 seconds at 30 FPS)
+        self.laser_timer = 0                                 # seconds the laser has been shown
+        self.laser_duration = LASER_DURATION                 # seconds to show laser
         self.laser_target_pos = None                         # position where laser should end
         
         # calculate initial angle and gun_end
@@ -41,7 +42,8 @@ class Defense():
         self.gun_end = (self.pos[0] + int(self.gun_size * math.sin(self.angle)), 
                         self.pos[1] + int(self.gun_size * math.cos(self.angle)))
 
-    def update(self):
+    # dt: seconds of game time since the last update
+    def update(self, dt = 1.0 / FPS):
         # Handle aiming animation
         if self.is_aiming and self.current_target:
             # Get target position
@@ -57,7 +59,7 @@ class Defense():
                 target_center = self.target_pos
             
             # Animate towards target position
-            if self.aiming_timer < self.aiming_duration:
+            if not timer_done(self.aiming_timer, self.aiming_duration):
                 # Interpolate between current target_pos and actual target
                 progress = self.aiming_timer / self.aiming_duration
                 # Use easing function for smooth animation
@@ -70,15 +72,15 @@ class Defense():
                 new_y = start_y + (end_y - start_y) * eased_progress
                 
                 self.target_pos = (new_x, new_y)
-                self.aiming_timer += 1
+                self.aiming_timer += dt
             else:
                 # Aiming complete
                 self.target_pos = target_center
         
         # Handle laser beam animation
         if self.laser_active:
-            self.laser_timer += 1
-            if self.laser_timer >= self.laser_duration:
+            self.laser_timer += dt
+            if timer_done(self.laser_timer, self.laser_duration):
                 self.laser_active = False
                 self.laser_timer = 0
                 self.laser_target_pos = None
@@ -125,7 +127,7 @@ class Defense():
         # Draw laser beam when active
         if self.laser_active and self.laser_target_pos:
             # Calculate laser fade based on timer
-            fade_progress = self.laser_timer / self.laser_duration
+            fade_progress = min(1.0, self.laser_timer / self.laser_duration)
             laser_alpha = int(255 * (1 - fade_progress))  # Fade out over time
             
             # Create bright blue laser color
@@ -165,7 +167,7 @@ class Defense():
     def shoot(self, missile_list):
         if self.ammo > 0:
             # create new missile(origin, target, false=launch up, speed, points, trail color, warhead color)
-            missile_list.append(Missile(self.pos, self.target_pos, False, 8, 0, INTERCEPTER_TRAIL, INTERCEPTER))
+            missile_list.append(missile_pool.acquire(self.pos, self.target_pos, False, 8, 0, INTERCEPTER_TRAIL, INTERCEPTER))
             self.ammo -= 1
             try:
                 from functions import sfx_shoot
@@ -206,7 +208,7 @@ class Defense():
     
     def is_aiming_complete(self):
         """Check if the aiming animation is complete"""
-        return self.is_aiming and self.aiming_timer >= self.aiming_duration
+        return self.is_aiming and timer_done(self.aiming_timer, self.aiming_duration)
     
     def fire_laser(self, target_pos):
         """Activate laser beam towards target position"""
@@ -0,0 +1,116 @@
+import bisect
+import math
+import random
+from config import *
+
+# Touch-typing finger for each column (0 = left pinky ... 7 = right pinky)
+COLUMN_FINGERS = [0, 1, 2, 3, 3, 4, 4, 5, 6, 7]
+ROW_STAGGER = [0.0, 0.25, 0.75]                 # horizontal offset of top, home and bottom rows
+HOME_ROW = 1
+
+# Weights of each component in the difficulty score
+TRAVEL_WEIGHT           = 1.0   # per key-width a finger moves off its home key
+SAME_FINGER_WEIGHT      = 1.5   # per bigram typed twice with the same finger
+ROW_CHANGE_WEIGHT       = 0.5   # per bigram that jumps between rows
+OFF_HOME_WEIGHT         = 1.0   # per character not on the home row
+LENGTH_WEIGHT           = 1.0   # per character
+
+KEY_POSITIONS = {}          # letter -> (x, y) in key widths
+KEY_FINGERS = {}            # letter -> finger number
+HOME_POSITIONS = {}         # finger -> (x, y) of its home key
+for _row, _keys in enumerate((TOP_ROW_KEYS, HOME_ROW_KEYS, BOTTOM_ROW_KEYS)):
+    for _column, _key in enumerate(_keys):
+        KEY_POSITIONS[_key] = (_column + ROW_STAGGER[_row], _row)
+        KEY_FINGERS[_key] = COLUMN_FINGERS[_column]
+for _finger, _key in enumerate("asdf"):
+    HOME_POSITIONS[_finger] = KEY_POSITIONS[_key]
+for _finger, _key in zip((4, 5, 6, 7), "jkl;"):
+    HOME_POSITIONS[_finger] = KEY_POSITIONS.get(_key, (_finger + 2 + ROW_STAGGER[HOME_ROW], HOME_ROW))
+
+
+def word_features(word):
+    """Return (finger travel, same-finger bigrams, row changes, home-row share)"""
+    travel = 0.0
+    same_finger = 0
+    row_changes = 0
+    home = 0
+    finger_at = dict(HOME_POSITIONS)
+    previous = None
+    for char in word:
+        x, y = KEY_POSITIONS[char]
+        finger = KEY_FINGERS[char]
+        fx, fy = finger_at[finger]
+        travel += math.hypot(x - fx, y - fy)
+        finger_at[finger] = (x, y)
+        if y == HOME_ROW:
+            home += 1
+        if previous is not None:
+            if KEY_FINGERS[previous] == finger and previous != char:
+                same_finger += 1
+            if KEY_POSITIONS[previous][1] != y:
+                row_changes += 1
+        previous = char
+    return travel, same_finger, row_changes, home / len(word)
+
+
+def word_difficulty(word):
+    """Keyboard-ergonomics difficulty score for a lowercase word"""
+    travel, same_finger, row_changes, home_share = word_features(word)
+    return (LENGTH_WEIGHT * len(word)
+            + TRAVEL_WEIGHT * travel
+            + SAME_FINGER_WEIGHT * same_finger
+            + ROW_CHANGE_WEIGHT * row_changes
+            + OFF_HOME_WEIGHT * len(word) * (1 - home_share))
+
+
+def can_score(word):
+    return bool(word) and all(char in KEY_POSITIONS for char in word)
+
+
+class DifficultyIndex():
+    """Words sorted by precomputed difficulty score for O(log n) band lookups.
+
+    scores and words are parallel sequences sorted by score; they can be
+    plain lists or views over a compiled word index.
+    """
+    def __init__(self, scores, words):
+        self.scores = scores
+        self.words = words
+
+    @classmethod
+    def from_words(cls, words):
+        scored = sorted((word_difficulty(word), word) for word in set(words) if can_score(word))
+        return cls([score for score, _ in scored], [word for _, word in scored])
+
+    def band(self, low, high):
+        """Index range [start, end) of words scoring between low and high"""
+        return bisect.bisect_left(self.scores, low), bisect.bisect_right(self.scores, high)
+
+    def pick(self, low, high, active_prefixes = (), rng = random, max_attempts = 20):
+        """Random word in the score band whose prefix is not on screen, or None"""
+        start, end = self.band(low, high)
+        if start >= end:
+            return None
+        word = None
+        for _ in range(max_attempts):
+            word = self.words[rng.randrange(start, end)]
+            if word[:2] not in active_prefixes:
+                return word
+        return word  # Last resort
+
+
+# Target difficulty band per level: (highest level, lowest score, highest score); None = every later level
+LEVEL_DIFFICULTY_BANDS = [
+    (3,    0.0,  6.5),
+    (5,    2.0, 10.0),
+    (7,    4.0, 12.0),
+    (9,    6.0, 15.0),
+    (12,   8.0, 19.0),
+    (16,  10.0, 22.0),
+    (None, 15.0, 99.0),
+]
+
+def band_for_level(difficulty):
+    for max_level, low, high in LEVEL_DIFFICULTY_BANDS:
+        if max_level is None or difficulty <= max_level:
+            return low, high
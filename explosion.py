@@ -1,9 +1,17 @@
 import pygame
 from config import *
+from pool import EntityPool, next_serial
 
 
 class Explosion():
+    __slots__ = ('pos', 'points_multiplier', 'blast_radius', 'blast_color', 'expand_rate',
+                 'dwell_time', 'radius', 'complete', 'serial')
+
     def __init__(self, pos, points_multiplier = 0, blast_radius = 50, blast_color = NUKE_EXPLOSION, expand_rate = 3, dwell_time = 0):
+        self.reset(pos, points_multiplier, blast_radius, blast_color, expand_rate, dwell_time)
+
+    # (re)initialise every field; pooled explosions are reset instead of rebuilt
+    def reset(self, pos, points_multiplier = 0, blast_radius = 50, blast_color = NUKE_EXPLOSION, expand_rate = 3, dwell_time = 0):
         self.pos = pos                              # blast centre
         self.points_multiplier = points_multiplier  # only intercepters have multiplier > 0 so only valid intercepts result in score
         self.blast_radius = blast_radius            # maximum radius of blast
@@ -12,6 +20,7 @@ class Explosion():
         self.dwell_time =  dwell_time                # time to stay at maximum radius
         self.radius = 0                             # current radius of explosion
         self.complete = False                       # is the explosion finished
+        self.serial = next_serial()
     
     # draw the explosion
     def draw(self, screen):
@@ -37,4 +46,8 @@ class Explosion():
         return self.radius
         
     def get_points_multiplier(self):
-        return self.points_multiplier
\ No newline at end of file
+        return self.points_multiplier
+
+
+# shared free-list for blasts
+explosion_pool = EntityPool(Explosion)
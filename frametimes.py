@@ -0,0 +1,31 @@
+import bisect
+
+FRAME_TIME_BUCKETS = (0.020, 0.034, 0.050, 0.100, 0.250)   # upper bounds in seconds; 34 ms is one frame at 30 FPS
+
+
+class FrameTimeHistogram():
+    """Counts how long frames took, to spot hitches (e.g. during replay saves).
+
+    Frames over 250 ms are mostly deliberate holds (pause, level prompt)
+    rather than hitches, so they get their own bucket.
+    """
+    def __init__(self, buckets = FRAME_TIME_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.frames = 0
+        self.longest = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.frames += 1
+        self.longest = max(self.longest, seconds)
+
+    def get_stats(self):
+        stats = {}
+        low = 0
+        for high, count in zip(self.buckets, self.counts):
+            stats[f"{low * 1000:.0f}-{high * 1000:.0f}ms"] = count
+            low = high
+        stats[f">{low * 1000:.0f}ms"] = self.counts[-1]
+        stats["longest"] = f"{self.longest * 1000:.0f}ms"
+        return stats
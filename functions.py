@@ -5,7 +5,7 @@ import os
 import math
 from config import *
 import json
-import random
+from rngstreams import audio_rng
 import glob
 
 # System sound helpers (Windows)
@@ -99,7 +99,7 @@ def init_audio():
                     pass
         # Prepare a shuffled bag to avoid frequent repeats
         _EXPLODE_BAG = _EXPLODE_SOUNDS.copy()
-        random.shuffle(_EXPLODE_BAG)
+        audio_rng.shuffle(_EXPLODE_BAG)
 
         # Load all city-down sounds with common extensions
         files_cd = []
@@ -129,7 +129,7 @@ def init_audio():
                 except Exception:
                     pass
         _CITYDOWN_BAG = _CITYDOWN_SOUNDS.copy()
-        random.shuffle(_CITYDOWN_BAG)
+        audio_rng.shuffle(_CITYDOWN_BAG)
 
         # Load all miss sounds with common extensions
         files_miss = []
@@ -159,7 +159,7 @@ def init_audio():
                 except Exception:
                     pass
         _MISS_BAG = _MISS_SOUNDS.copy()
-        random.shuffle(_MISS_BAG)
+        audio_rng.shuffle(_MISS_BAG)
 
         # Load all powerup sounds with common extensions
         files_powerup = []
@@ -191,7 +191,7 @@ def init_audio():
                 except Exception:
                     pass
         _POWERUP_BAG = _POWERUP_SOUNDS.copy()
-        random.shuffle(_POWERUP_BAG)
+        audio_rng.shuffle(_POWERUP_BAG)
         _AUDIO_READY = True
     except Exception:
         # mixer not available; keep using system sounds
@@ -204,7 +204,7 @@ def play_random_explode():
         if _EXPLODE_SOUNDS:
             if not _EXPLODE_BAG:
                 _EXPLODE_BAG = _EXPLODE_SOUNDS.copy()
-                random.shuffle(_EXPLODE_BAG)
+                audio_rng.shuffle(_EXPLODE_BAG)
                 # avoid immediate repeat if possible
                 if _LAST_EXPLODE is not None and len(_EXPLODE_BAG) > 1 and _EXPLODE_BAG[0] is _LAST_EXPLODE:
                     _EXPLODE_BAG.append(_EXPLODE_BAG.pop(0))
@@ -217,7 +217,7 @@ def play_random_explode():
     # Fallback: try music channel with file paths
     try:
         if _EXPLODE_FILES:
-            pygame.mixer.music.load(random.choice(_EXPLODE_FILES))
+            pygame.mixer.music.load(audio_rng.choice(_EXPLODE_FILES))
             pygame.mixer.music.play()
             return
     except Exception:
@@ -232,7 +232,7 @@ def play_random_citydown():
         if _CITYDOWN_SOUNDS:
             if not _CITYDOWN_BAG:
                 _CITYDOWN_BAG = _CITYDOWN_SOUNDS.copy()
-                random.shuffle(_CITYDOWN_BAG)
+                audio_rng.shuffle(_CITYDOWN_BAG)
                 if _LAST_CITYDOWN is not None and len(_CITYDOWN_BAG) > 1 and _CITYDOWN_BAG[0] is _LAST_CITYDOWN:
                     _CITYDOWN_BAG.append(_CITYDOWN_BAG.pop(0))
             s = _CITYDOWN_BAG.pop()
@@ -244,7 +244,7 @@ def play_random_citydown():
     # Fallback: try music channel with file paths
     try:
         if _CITYDOWN_FILES:
-            pygame.mixer.music.load(random.choice(_CITYDOWN_FILES))
+            pygame.mixer.music.load(audio_rng.choice(_CITYDOWN_FILES))
             pygame.mixer.music.play()
             return
     except Exception:
@@ -259,7 +259,7 @@ def play_random_miss():
         if _MISS_SOUNDS:
             if not _MISS_BAG:
                 _MISS_BAG = _MISS_SOUNDS.copy()
-                random.shuffle(_MISS_BAG)
+                audio_rng.shuffle(_MISS_BAG)
                 if _LAST_MISS is not None and len(_MISS_BAG) > 1 and _MISS_BAG[0] is _LAST_MISS:
                     _MISS_BAG.append(_MISS_BAG.pop(0))
             s = _MISS_BAG.pop()
@@ -277,7 +277,7 @@ def play_random_miss():
                     pygame.mixer.music.stop()
             except Exception:
                 pass
-            pygame.mixer.music.load(random.choice(_MISS_FILES))
+            pygame.mixer.music.load(audio_rng.choice(_MISS_FILES))
             pygame.mixer.music.play()
             return
     except Exception:
@@ -292,7 +292,7 @@ def play_random_powerup():
         if _POWERUP_SOUNDS:
             if not _POWERUP_BAG:
                 _POWERUP_BAG = _POWERUP_SOUNDS.copy()
-                random.shuffle(_POWERUP_BAG)
+                audio_rng.shuffle(_POWERUP_BAG)
                 # avoid immediate repeat if possible
                 if _LAST_POWERUP is not None and len(_POWERUP_BAG) > 1 and _POWERUP_BAG[0] is _LAST_POWERUP:
                     _POWERUP_BAG.append(_POWERUP_BAG.pop(0))
@@ -305,7 +305,7 @@ def play_random_powerup():
     # Fallback: try music channel with file paths
     try:
         if _POWERUP_FILES:
-            pygame.mixer.music.load(random.choice(_POWERUP_FILES))
+            pygame.mixer.music.load(audio_rng.choice(_POWERUP_FILES))
             pygame.mixer.music.play()
             return
     except Exception:
@@ -314,10 +314,25 @@ def play_random_powerup():
     try:
         # Use a higher pitched version of explode sound as fallback
         if _EXPLODE_SOUNDS:
-            random.choice(_EXPLODE_SOUNDS).play()
+            audio_rng.choice(_EXPLODE_SOUNDS).play()
     except Exception:
         pass
 
+def play_sound(name):
+    # play a game sound by name; GameSession reports its sounds through this
+    try:
+        _SOUND_PLAYERS[name]()
+    except Exception:
+        pass
+
+_SOUND_PLAYERS = {
+    'explode': play_random_explode,
+    'citydown': play_random_citydown,
+    'miss': play_random_miss,
+    'powerup': play_random_powerup,
+    'intercept': sfx_intercept,
+}
+
 def sfx_wrong_key():
     # Annoying error sound for wrong typing key
     play_system_sound('SystemExclamation')
@@ -426,22 +441,69 @@ def distance(p, q):
     return math.sqrt((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2)
 
 
-def check_collisions(missile_list, explosion_list, city_list):
-    score = 0
+def distance_squared(p, q):
+    return (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2
 
-    for explosion in explosion_list:
-        for missile in missile_list[:]:
-            if explosion.get_radius() > distance(explosion.get_center(), missile.get_pos()):
-                score += missile.get_points() * explosion.get_points_multiplier()
-                missile_list.remove(missile)
-        for city in city_list[:]:
-            if explosion.get_radius() > distance(explosion.get_center(), city.get_pos()):
-                city.set_destroyed(True)    # might not be needed if I just remove city from list
-                city_list.remove(city)
+
+def check_collisions(missile_list, explosion_list, city_list, removed_missiles = None, destroyed_cities = None):
+    # removed_missiles (optional list) collects missiles destroyed by explosions
+    # destroyed_cities (optional list) collects destroyed cities instead of playing their sound here
+    # Each missile or city is destroyed by the first explosion (in list order)
+    # whose blast reaches it. Missiles are binned into a uniform grid with cells
+    # as large as the biggest blast, so an explosion only tests the 3x3 cells
+    # around its centre; both lists are compacted in one pass at the end.
+    score = 0
+    blasts = [(explosion, explosion.get_center(), explosion.get_radius()) for explosion in explosion_list]
+    blasts = [blast for blast in blasts if blast[2] > 0]
+    if not blasts:
+        return score
+
+    if missile_list:
+        cell = max(radius for _, _, radius in blasts)
+        grid = {}                                   # (column, row) -> [(index, missile, pos), ...]
+        for index, missile in enumerate(missile_list):
+            pos = missile.get_pos()
+            grid.setdefault((int(pos[0] // cell), int(pos[1] // cell)), []).append((index, missile, pos))
+
+        hit = set()                                 # indexes of destroyed missiles
+        for explosion, center, radius in blasts:
+            column, row = int(center[0] // cell), int(center[1] // cell)
+            radius_squared = radius * radius
+            caught = []
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for index, missile, pos in grid.get((column + dx, row + dy), ()):
+                        if index not in hit and radius_squared > distance_squared(center, pos):
+                            caught.append(index)
+            if caught:
+                caught.sort()
+                multiplier = explosion.get_points_multiplier()
+                for index in caught:
+                    hit.add(index)
+                    missile = missile_list[index]
+                    score += missile.get_points() * multiplier
+                    if removed_missiles is not None:
+                        removed_missiles.append(missile)
+        if hit:
+            missile_list[:] = [missile for index, missile in enumerate(missile_list) if index not in hit]
+
+    # only a handful of cities, so test them directly
+    survivors = []
+    for city in city_list:
+        pos = city.get_pos()
+        if any(radius * radius > distance_squared(center, pos) for _, center, radius in blasts):
+            city.set_destroyed(True)    # might not be needed if I just remove city from list
+            if destroyed_cities is not None:
+                destroyed_cities.append(city)
+            else:
                 try:
                     play_random_citydown()
                 except Exception:
                     pass
+        else:
+            survivors.append(city)
+    if len(survivors) != len(city_list):
+        city_list[:] = survivors
 
     return score
 
@@ -0,0 +1,42 @@
+from config import *
+
+TIME_EPSILON = 1e-9     # tolerance when a seconds timer is compared with its duration
+
+
+class GameClock():
+    """Central game time read by every timer.
+
+    Each simulation step is one fixed timestep of game time (sim_dt).
+    real_dt is the wall-clock time that step stands for: a full step at
+    normal speed, 1/speed of one in turbo. Gameplay timers (aiming, laser,
+    powerup spawning) run on sim_dt so they keep pace with missiles;
+    player-facing timers (score multiplier, temporary turbo, HUD flashing)
+    run on real_dt so their length on screen does not change with turbo.
+    Both are derived from the step count and speed, never measured, so a
+    session steps identically wherever it runs.
+    """
+    def __init__(self, fps = FPS):
+        self.step_seconds = 1.0 / fps               # game time per simulation step
+        self.speed = 1.0                            # simulation steps per real-time step (turbo)
+        self.steps = 0
+        self.sim_time = 0.0                         # seconds of game time simulated
+        self.real_time = 0.0                        # seconds of real time those steps stand for
+        self.sim_dt = self.step_seconds
+        self.real_dt = self.step_seconds
+
+    def set_speed(self, speed):
+        """Set the turbo factor for the following steps (1.0 = real time)"""
+        self.speed = max(1.0, float(speed))
+
+    def tick(self):
+        """Advance by one simulation step"""
+        self.steps += 1
+        self.sim_dt = self.step_seconds
+        self.real_dt = self.step_seconds / self.speed
+        self.sim_time += self.sim_dt
+        self.real_time += self.real_dt
+
+
+def timer_done(elapsed, duration):
+    """Has a timer counting up in seconds reached its duration"""
+    return elapsed >= duration - TIME_EPSILON
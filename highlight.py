@@ -0,0 +1,46 @@
+class HighlightState():
+    """Tracks how much of each on-screen label the typed sequence has matched.
+
+    The matched-prefix length is recomputed only when the typed sequence or
+    the set of labelled targets changes, and is stored on each target as
+    ``typed_len`` so draw code just reads an integer.
+    """
+    def __init__(self):
+        self.sequence = ""                          # typed sequence the lengths were computed for
+        self.targets = {}                           # id(target) -> target with a tracked label
+
+    def set_sequence(self, typed_sequence):
+        """Update every target's matched prefix if the typed sequence changed"""
+        typed_sequence = typed_sequence.lower()
+        if typed_sequence == self.sequence:
+            return
+        self.sequence = typed_sequence
+        for target in self.targets.values():
+            target.typed_len = matched_prefix_len(self.sequence, target.label)
+
+    def add_target(self, target):
+        if not getattr(target, 'label', None):
+            return
+        self.targets[id(target)] = target
+        target.typed_len = matched_prefix_len(self.sequence, target.label)
+
+    def remove_target(self, target):
+        self.targets.pop(id(target), None)
+        target.typed_len = 0
+
+    def clear(self):
+        for target in self.targets.values():
+            target.typed_len = 0
+        self.targets.clear()
+        self.sequence = ""
+
+
+def matched_prefix_len(typed_sequence, label):
+    """Length of the longest suffix of typed_sequence that starts label"""
+    if not typed_sequence or not label:
+        return 0
+    label = str(label).lower()
+    for i in range(min(len(typed_sequence), len(label)), 0, -1):
+        if label.startswith(typed_sequence[-i:]):
+            return i
+    return 0
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from config import *
+
+
+class LabelCache():
+    """LRU cache of rendered text surfaces keyed by (text, colour, font)"""
+    def __init__(self, max_entries = LABEL_CACHE_MAX_ENTRIES, max_bytes = LABEL_CACHE_MAX_BYTES):
+        self.max_entries = max_entries              # maximum number of cached surfaces
+        self.max_bytes = max_bytes                  # memory cap for all cached pixel data
+        self.surfaces = OrderedDict()               # (text, colour, font) -> surface, oldest first
+        self.bytes_used = 0                         # estimated pixel memory held by the cache
+        self.hits = 0                               # renders served from the cache
+        self.misses = 0                             # renders that had to call font.render
+        self.evictions = 0                          # surfaces dropped to stay under the caps
+
+    def render(self, text, color, font = game_font):
+        """Return a rendered surface for text, rendering it only on first use"""
+        key = (text, tuple(color), font)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, False, color)
+        self.surfaces[key] = surface
+        self.bytes_used += self._surface_bytes(surface)
+        self._evict()
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes_used = 0
+
+    def get_stats(self):
+        """Return hit/miss counters for checking the cache under load"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "bytes": self.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0
+        }
+
+    # drop least recently used surfaces until both caps are respected
+    def _evict(self):
+        while self.surfaces and (len(self.surfaces) > self.max_entries or self.bytes_used > self.max_bytes):
+            _, surface = self.surfaces.popitem(last=False)
+            self.bytes_used -= self._surface_bytes(surface)
+            self.evictions += 1
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# shared cache used by all label drawing code
+label_cache = LabelCache()
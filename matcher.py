@@ -0,0 +1,271 @@
+from collections import Counter
+
+
+class MatchEntry():
+    """A labelled target and how many of its letters are still missing"""
+    def __init__(self, kind, target, word, order, have):
+        self.kind = kind                            # 'missile' or 'powerup'
+        self.target = target                        # the on-screen object
+        self.word = word                            # lowercase label
+        self.order = order                          # registration order, breaks length ties
+        self.need = Counter(word)                   # letters required to complete the word
+        self.missing = sum(max(0, n - have.get(c, 0)) for c, n in self.need.items())
+
+
+class WordMatcher():
+    """Incremental multiset word matcher for the keystroke handler.
+
+    Letters can complete a word in any order. The matcher keeps a count of
+    typed letters and, per target, the number of letters still missing, so
+    a keystroke only touches targets whose word contains the typed letter.
+    """
+    def __init__(self):
+        self.entries = {}                           # id(target) -> MatchEntry
+        self.by_char = {}                           # letter -> {id(target): MatchEntry}
+        self.have = {}                              # letter -> times typed since last reset
+        self.complete = {}                          # id(target) -> MatchEntry with nothing missing
+        self.touched = set()                        # ids whose missing count differs from len(word)
+        self.order = 0
+
+    def add(self, kind, target):
+        """Start matching a target's label"""
+        if not getattr(target, 'label', None):
+            return
+        self.remove(target)
+        key = id(target)
+        entry = MatchEntry(kind, target, str(target.label).lower(), self.order, self.have)
+        self.order += 1
+        self.entries[key] = entry
+        for char in entry.need:
+            self.by_char.setdefault(char, {})[key] = entry
+        if entry.missing != len(entry.word):
+            self.touched.add(key)
+        if entry.missing == 0:
+            self.complete[key] = entry
+
+    def remove(self, target):
+        """Stop matching a target (destroyed, off-screen or already claimed)"""
+        key = id(target)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for char in entry.need:
+            bucket = self.by_char.get(char)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.by_char[char]
+        self.complete.pop(key, None)
+        self.touched.discard(key)
+
+    def feed(self, char):
+        """Add a typed letter and return completed (kind, target, word) tuples.
+
+        Completed words are returned longest first (powerups before missiles
+        on ties); each consumes its letters so shorter words can only match
+        with what is left, exactly like matching against the full sequence.
+        """
+        count = self.have.get(char, 0) + 1
+        self.have[char] = count
+        for key, entry in self.by_char.get(char, {}).items():
+            if entry.need[char] >= count:
+                entry.missing -= 1
+                self.touched.add(key)
+                if entry.missing == 0:
+                    self.complete[key] = entry
+
+        if not self.complete:
+            return []
+        candidates = sorted(self.complete.values(),
+                            key=lambda e: (-len(e.word), 0 if e.kind == 'powerup' else 1, e.order))
+        remaining = dict(self.have)
+        completed = []
+        for entry in candidates:
+            if all(remaining.get(c, 0) >= n for c, n in entry.need.items()):
+                for c, n in entry.need.items():
+                    remaining[c] -= n
+                completed.append((entry.kind, entry.target, entry.word))
+        return completed
+
+    def reset(self):
+        """Forget typed letters (typed sequence was cleared)"""
+        self.have.clear()
+        for key in self.touched:
+            entry = self.entries[key]
+            entry.missing = len(entry.word)
+        self.touched.clear()
+        self.complete.clear()
+
+    def clear(self):
+        self.entries.clear()
+        self.by_char.clear()
+        self.have.clear()
+        self.complete.clear()
+        self.touched.clear()
+
+    def has_char(self, char):
+        """Is this letter part of any on-screen word"""
+        return char in self.by_char
+
+    def has_potential_match(self, typed_sequence):
+        """Does any on-screen word contain the typed sequence"""
+        return any(entry.word.find(typed_sequence) != -1 for entry in self.entries.values())
+
+
+class TrieNode():
+    """Aho-Corasick automaton state: the typed text ends with this prefix"""
+    def __init__(self, depth, parent = None, char = ""):
+        self.depth = depth                          # length of the prefix this node spells
+        self.parent = parent
+        self.char = char                            # letter on the edge from the parent
+        self.children = {}                          # letter -> TrieNode (trie edges)
+        self.count = 0                              # labels passing through this node
+        self.ends = []                              # MatchEntry list for labels ending here
+        self.fail = None                            # longest proper suffix that is also a prefix
+        self.out = None                             # nearest suffix node where a label ends
+        self.delta = {}                             # letter -> next state, filled in as needed
+        self.generation = -1                        # trie generation fail, out and delta were computed for
+
+
+class StrictMatcher():
+    """In-order word matcher backed by an Aho-Corasick automaton.
+
+    Only contiguous typed text completes a word. Labels are inserted into
+    and pruned from the trie as targets spawn and die. The goto function
+    is computed lazily: a state's failure link and transitions are worked
+    out the first time a keystroke needs them and memoised until the label
+    set changes (a generation counter, so nothing is rebuilt up front).
+    After a change a keystroke costs at most a few lookups per letter of
+    the longest label; otherwise it is a single dictionary lookup.
+    """
+    def __init__(self):
+        self.root = TrieNode(0)
+        self.state = self.root                      # automaton state after the typed text
+        self.text = ""                              # letters typed since last reset
+        self.entries = {}                           # id(target) -> MatchEntry
+        self.char_counts = {}                       # letter -> number of labels using it
+        self.lengths = {}                           # label length -> number of labels
+        self.generation = 0                         # bumped whenever a label enters or leaves
+        self.state_generation = 0                   # generation self.state was found in
+        self.order = 0
+
+    def add(self, kind, target):
+        """Insert a target's label into the automaton"""
+        if not getattr(target, 'label', None):
+            return
+        self.remove(target)
+        entry = MatchEntry(kind, target, str(target.label).lower(), self.order, {})
+        self.order += 1
+        self.entries[id(target)] = entry
+        node = self.root
+        node.count += 1
+        for char in entry.word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode(node.depth + 1, node, char)
+            child.count += 1
+            node = child
+        node.ends.append(entry)
+        for char in entry.need:
+            self.char_counts[char] = self.char_counts.get(char, 0) + 1
+        self.lengths[len(entry.word)] = self.lengths.get(len(entry.word), 0) + 1
+        self.generation += 1
+
+    def remove(self, target):
+        """Remove a target's label, pruning trie branches nobody uses"""
+        entry = self.entries.pop(id(target), None)
+        if entry is None:
+            return
+        node = self.root
+        node.count -= 1
+        for char in entry.word:
+            child = node.children[char]
+            child.count -= 1
+            if child.count == 0:
+                del node.children[char]
+                break
+            node = child
+        else:
+            node.ends.remove(entry)
+        for char in entry.need:
+            self.char_counts[char] -= 1
+            if self.char_counts[char] == 0:
+                del self.char_counts[char]
+        self.lengths[len(entry.word)] -= 1
+        if self.lengths[len(entry.word)] == 0:
+            del self.lengths[len(entry.word)]
+        self.generation += 1
+
+    def feed(self, char):
+        """Advance one state and return the longest label the typed text now ends with"""
+        self._sync_state()
+        self.text += char
+        self.state = self._goto(self.state, char)
+        node = self.state if self.state.ends else self._out(self.state)
+        if node is None:
+            return []
+        entry = node.ends[0]
+        return [(entry.kind, entry.target, entry.word)]
+
+    def reset(self):
+        self.state = self.root
+        self.text = ""
+        self.state_generation = self.generation
+
+    def clear(self):
+        self.root = TrieNode(0)
+        self.entries.clear()
+        self.char_counts.clear()
+        self.lengths.clear()
+        self.generation += 1
+        self.reset()
+
+    def has_char(self, char):
+        return char in self.char_counts
+
+    def has_potential_match(self, typed_sequence):
+        """Does the typed text end with the start of some label"""
+        self._sync_state()
+        return self.state is not self.root
+
+    # after labels changed, find the state again: the longest suffix of the typed text that
+    # starts a label, which is never longer than the longest label, so only that much is replayed
+    def _sync_state(self):
+        if self.state_generation == self.generation:
+            return
+        self.state_generation = self.generation
+        longest = max(self.lengths) if self.lengths else 0
+        state = self.root
+        for char in self.text[max(0, len(self.text) - longest):]:
+            state = self._goto(state, char)
+        self.state = state
+
+    # drop a node's memoised links if they were computed before the last label change
+    def _current(self, node):
+        if node.generation != self.generation:
+            node.generation = self.generation
+            node.delta = {}
+            if node is self.root:
+                node.fail = None
+            elif node.parent is self.root:
+                node.fail = self.root
+            else:
+                node.fail = self._goto(self._fail(node.parent), node.char)
+            node.out = None if node.fail is None else (node.fail if node.fail.ends else self._out(node.fail))
+        return node
+
+    def _fail(self, node):
+        return self._current(node).fail
+
+    def _out(self, node):
+        return self._current(node).out
+
+    def _goto(self, node, char):
+        delta = self._current(node).delta
+        target = delta.get(char)
+        if target is None:
+            target = node.children.get(char)
+            if target is None:
+                target = self.root if node is self.root else self._goto(node.fail, char)
+            delta[char] = target
+        return target
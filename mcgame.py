@@ -1,8 +1,11 @@
 import pygame
-import random
+from rngstreams import spawn_rng, word_rng, powerup_rng
 from config import *
 from functions import *
-from missile import Missile
+from missile import missile_pool
+from wordpool import get_tier_pool, get_difficulty_index
+from ergonomics import band_for_level
+from gameclock import TIME_EPSILON
 
 class McGame():
     def __init__(self, difficulty = 1, high_score = 0):
@@ -21,9 +24,9 @@ class McGame():
         
         # Powerup system
         self.point_multiplier = 1.0  # Normal scoring
-        self.multiplier_timer = 0    # How long multiplier lasts
-        self.powerup_spawn_timer = 0 # When to spawn next powerup
-        self.flash_timer = 0         # For flashing effect
+        self.multiplier_timer = 0    # Seconds the multiplier still lasts
+        self.powerup_spawn_timer = 0 # Seconds of game time since the last powerup
+        self.flash_timer = 0         # Seconds into the flashing effect
         
         # Create smaller font for bonus text
         self.small_font = pygame.font.Font('data/fnt/PressStart2P-Regular.ttf', 12)
@@ -41,7 +44,7 @@ class McGame():
         # Show multiplier status if active with cool flashing effect
         if self.point_multiplier > 1.0:
             # Create pulsing alpha effect based on flash timer
-            flash_phase = self.flash_timer / 60.0  # 0 to 1 over 2 seconds
+            flash_phase = self.flash_timer / HUD_FLASH_PERIOD  # 0 to 1 over 2 seconds
             alpha_multiplier = 0.7 + 0.3 * abs(1 - 2 * flash_phase)  # Smooth pulse between 0.7 and 1.0
             
             # Calculate flashing color with slight color variation
@@ -57,8 +60,8 @@ class McGame():
             screen.blit(multiplier_text, (5, 35))
             
             # Show timer with same effect but slightly different phase
-            timer_seconds = self.multiplier_timer // 30
-            timer_alpha = 0.8 + 0.2 * abs(1 - 2 * ((self.flash_timer + 15) % 60) / 60.0)
+            timer_seconds = int(self.multiplier_timer)
+            timer_alpha = 0.8 + 0.2 * abs(1 - 2 * ((self.flash_timer + HUD_FLASH_PERIOD / 4) % HUD_FLASH_PERIOD) / HUD_FLASH_PERIOD)
             timer_color = (
                 int(base_color[0] * timer_alpha),
                 int(base_color[1] * timer_alpha),
@@ -68,14 +71,19 @@ class McGame():
             screen.blit(timer_text, (5, 50))
         # TBC - draw the remaining ammo
 
-    def update(self, missile_list, explosion_list, city_list):
+    def update(self, missile_list, explosion_list, city_list, removed_missiles = None, destroyed_cities = None, active_prefixes = (), spawned_missiles = None):
+        # active_prefixes: prefixes of words on screen, so new words don't conflict
+        # spawned_missiles (optional list) collects the missiles launched this frame
         # generate incoming missiles
         if self.missile_frequency % self.missile_interval == 0 and self.missile_count < self.max_missile_count:
             # pick a key label for this missile (home row weighted)
-            label = self._choose_key_label()
+            label = self._choose_key_label(active_prefixes)
             # Calculate missile speed based on difficulty level
             missile_speed = self._calculate_missile_speed()
-            missile_list.append(Missile(self.get_origin(), self.get_target(), True, missile_speed, 10, WARHEAD_TRAIL, WARHEAD, label))
+            missile = missile_pool.acquire(self.get_origin(), self.get_target(), True, missile_speed, 10, WARHEAD_TRAIL, WARHEAD, label)
+            missile_list.append(missile)
+            if spawned_missiles is not None:
+                spawned_missiles.append(missile)
             self.missile_count += 1
         # increment the frequency count
         self.missile_interval += 1
@@ -83,7 +91,7 @@ class McGame():
             self.missile_interval = 1
 
         # check for collisions
-        self.player_score += check_collisions(missile_list, explosion_list, city_list)
+        self.player_score += check_collisions(missile_list, explosion_list, city_list, removed_missiles, destroyed_cities)
 
         # check if all cities have been destroyed
         if city_list == []:
@@ -95,7 +103,7 @@ class McGame():
 
         return GAME_STATE_RUNNING
 
-    # start new level
+    # start new level (screen is optional so headless sessions can skip the prompt)
     def new_level(self, screen, defense):
         # set new level difficulty parameters
         self.max_missile_count += self.difficulty_increment
@@ -107,6 +115,9 @@ class McGame():
         defense.set_ammo(30)
 
 
+        if screen is None:
+            return
+
         # display prompt for next level and give short pause
         new_level = game_font.render('NEW INBOUND MISSILES DETECTED', False, INTERFACE_SEC)
         get_ready = game_font.render('GET READY', False, INTERFACE_SEC)
@@ -132,11 +143,11 @@ class McGame():
     # returns a target for new incoming nukes
     def get_target(self):
         # select a random point along the x axis at ground level
-        return (random.randint(0, SCREENSIZE[0]), self.ground_level)
+        return (spawn_rng.randint(0, SCREENSIZE[0]), self.ground_level)
     
     def get_origin(self):
         # select a random entry point for nuke
-        return (random.randint(0, SCREENSIZE[0]), SKY_LEVEL)
+        return (spawn_rng.randint(0, SCREENSIZE[0]), SKY_LEVEL)
 
     def set_difficulty(self, new_difficulty):
         self.difficulty = new_difficulty
@@ -147,33 +158,35 @@ class McGame():
     def activate_powerup(self, defense=None):
         # Activate 2x point multiplier for 10 seconds
         self.point_multiplier = 2.0
-        self.multiplier_timer = 300  # 10 seconds at 30 FPS
+        self.multiplier_timer = MULTIPLIER_DURATION
         
         # Turn turret orange when powerup is active
         if defense is not None:
             defense.activate_powerup()
         
-    def update_powerup_system(self, defense=None):
+    # sim_dt / real_dt: seconds of game time and of real time since the last update (see gameclock.py)
+    def update_powerup_system(self, defense=None, sim_dt=1.0 / FPS, real_dt=1.0 / FPS):
         # Update multiplier timer
         if self.multiplier_timer > 0:
-            self.multiplier_timer -= 1
-            if self.multiplier_timer <= 0:
+            self.multiplier_timer -= real_dt
+            if self.multiplier_timer <= TIME_EPSILON:
+                self.multiplier_timer = 0
                 self.point_multiplier = 1.0  # Reset to normal
                 # Reset turret color when powerup expires
                 if defense is not None:
                     defense.deactivate_powerup()
         
         # Update flash timer for cool effects
-        self.flash_timer += 1
-        if self.flash_timer > 60:  # Reset every 2 seconds at 30 FPS
+        self.flash_timer += real_dt
+        if self.flash_timer > HUD_FLASH_PERIOD:  # Reset every 2 seconds
             self.flash_timer = 0
         
         # Update powerup spawn timer
-        self.powerup_spawn_timer += 1
+        self.powerup_spawn_timer += sim_dt
         
     def should_spawn_powerup(self):
         # Spawn powerup roughly every 20-30 seconds, randomly
-        if self.powerup_spawn_timer > random.randint(600, 900):  # 20-30 seconds at 30 FPS
+        if self.powerup_spawn_timer > powerup_rng.randint(POWERUP_SPAWN_MIN * FPS, POWERUP_SPAWN_MAX * FPS) / FPS:  # 20-30 seconds
             self.powerup_spawn_timer = 0
             return True
         return False
@@ -183,76 +196,38 @@ class McGame():
         self.player_score += int(points * self.point_multiplier)
 
     # choose a keyboard key label with home-row bias, or words for higher levels
-    def _choose_key_label(self):
+    def _choose_key_label(self, active_prefixes = ()):
         if self.difficulty == 1:
             # Level 1: Only home row characters (easiest)
-            home_row = list("asdfghjkl")
-            return random.choice(home_row)
+            home_row = list(HOME_ROW_KEYS)
+            return word_rng.choice(home_row)
         elif self.difficulty == 2:
             # Level 2: All single characters with home row bias
-            top_row = list("qwertyuiop")
-            home_row = list("asdfghjkl")
-            bottom_row = list("zxcvbnm")
+            top_row = list(TOP_ROW_KEYS)
+            home_row = list(HOME_ROW_KEYS)
+            bottom_row = list(BOTTOM_ROW_KEYS)
             keys = top_row + home_row + bottom_row
             weights = ([1] * len(top_row)) + ([5] * len(home_row)) + ([2] * len(bottom_row))
             try:
-                return random.choices(keys, weights=weights, k=1)[0]
+                return word_rng.choices(keys, weights=weights, k=1)[0]
             except Exception:
                 # fallback if choices unavailable
                 bag = top_row + home_row * 5 + bottom_row * 2
-                return random.choice(bag)
+                return word_rng.choice(bag)
         else:
             # Multi-character words for level 3+
-            return self._choose_word()
+            return self._choose_word(active_prefixes)
     
-    def _choose_word(self):
-        # Import conflict checking functions from main module
-        import __main__
-        can_add_word = getattr(__main__, 'can_add_word', lambda x: True)
-        
-        # Word lists based on difficulty level with Gen Alpha shorthand
-        # Home row biased 2-letter words (easy to type)
-        two_letter_words = ["as", "ad", "ah", "if", "is", "of", "go", "do", "so", "to", "at", "it", "up", "hi", "he", "ha", "fr", "np", "ig", "fs"]
-        three_letter_words = ["cat", "dog", "run", "car", "sun", "red", "big", "hot", "old", "new", "win", "try", "get", "hit", "riz", "sus", "mid", "lit", "cap", "fax", "bet", "ong", "idc", "lol", "imo", "ngl", "rip", "say", "bye", "omg"]
-        four_letter_words = ["fire", "help", "jump", "fast", "slow", "cold", "blue", "dark", "long", "safe", "game", "time", "stop", "vibe", "flex", "slay", "yeet", "chad", "goat", "stan", "mood", "fomo", "simp", "cope", "edgy", "king", "giga", "poke"]
-        five_letter_words = ["power", "laser", "blast", "storm", "quick", "magic", "space", "fight", "brave", "peace", "skill", "vibes", "based", "bruh", "sigma", "alpha", "ratio", "cringe", "queen", "chief", "slaps", "bussin", "lowkey", "highkey"]
-        six_letter_words = ["defend", "shield", "attack", "weapon", "strong", "danger", "flight", "battle", "energy", "launch", "locked", "salty", "savage", "clutch", "periodt", "whatev"]
-        long_words = ["missile", "defense", "protect", "freedom", "victory", "command", "destroy", "counter", "nuclear", "warfare", "periodt", "ghosted", "lowkey", "highkey", "cappin", "snatched", "pressed"]
+    def _choose_word(self, active_prefixes = ()):
+        # Optionally pick from the level's ergonomics difficulty band
+        if ERGONOMIC_DIFFICULTY:
+            low, high = band_for_level(self.difficulty)
+            word = get_difficulty_index().pick(low, high, active_prefixes, word_rng)
+            if word:
+                return word
         
-        # Helper function to choose word without conflicts
-        def choose_without_conflict(word_list, max_attempts=50):
-            for _ in range(max_attempts):
-                word = random.choice(word_list)
-                if can_add_word(word):
-                    return word
-            # Fallback: return first available word or any word if none available
-            for word in word_list:
-                if can_add_word(word):
-                    return word
-            return random.choice(word_list)  # Last resort
-        
-        # Progressive difficulty: start with 2-letter, gradually add longer words
-        if self.difficulty <= 3:
-            # Levels 3: Only 2-letter words
-            return choose_without_conflict(two_letter_words)
-        elif self.difficulty <= 5:
-            # Levels 4-5: Mix of 2 and 3 letter words
-            return choose_without_conflict(two_letter_words + three_letter_words)
-        elif self.difficulty <= 7:
-            # Levels 6-7: Mostly 3-letter, some 2-letter
-            return choose_without_conflict(two_letter_words + three_letter_words * 3)  # Weight 3-letter more
-        elif self.difficulty <= 9:
-            # Levels 8-9: 3 and 4 letter words
-            return choose_without_conflict(three_letter_words + four_letter_words)
-        elif self.difficulty <= 12:
-            # Levels 10-12: 4 and 5 letter words
-            return choose_without_conflict(four_letter_words + five_letter_words)
-        elif self.difficulty <= 16:
-            # Levels 13-16: 5 and 6 letter words
-            return choose_without_conflict(five_letter_words + six_letter_words)
-        else:
-            # Level 17+: 6+ letter words
-            return choose_without_conflict(six_letter_words + long_words)
+        # Progressive difficulty: start with 2-letter, gradually add longer words (see wordpool.WORD_TIERS)
+        return get_tier_pool(self.difficulty).choose(active_prefixes, word_rng)
     
     def _calculate_missile_speed(self):
         # Progressive speed scaling: slow start, medium at level 10, very fast at level 20+
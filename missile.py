@@ -2,11 +2,22 @@ import pygame
 import math
 from config import *
 from functions import *
-from explosion import Explosion
+from explosion import explosion_pool
+from labelcache import label_cache
+from pool import EntityPool, next_serial
 
 
 class Missile():
+    __slots__ = ('origin_pos', 'target_pos', 'incoming', 'speed', 'points', '_travel_dist',
+                 'warhead_color', 'trail_color', 'warhead_size', 'trail_width', '_pos',
+                 'x', 'y', 'm', 'angle', 'direction', 'dist_to_target', 'detonated', 'label',
+                 'typed_len', 'field', 'slot', 'prefix_tracked', 'serial')
+
     def __init__(self, origin_pos, target_pos, incoming = True, speed = 1, points = 10, trail_color = WARHEAD_TRAIL, warhead_color = WARHEAD, label=None):
+        self.reset(origin_pos, target_pos, incoming, speed, points, trail_color, warhead_color, label)
+
+    # (re)initialise every field; pooled missiles are reset instead of rebuilt
+    def reset(self, origin_pos, target_pos, incoming = True, speed = 1, points = 10, trail_color = WARHEAD_TRAIL, warhead_color = WARHEAD, label=None):
         self.origin_pos = origin_pos                # starting position of missile
         self.target_pos = target_pos                # end position of missile
         if incoming == True:                        # is this missile incoming (1 = yes[default], -1 = no)
@@ -15,12 +26,12 @@ class Missile():
             self.incoming = -1                  
         self.speed = speed                          # missile speed
         self.points = points                        # points awarded for destroying missile
-        self.travel_dist = 1                        # distance traveled by missile
+        self._travel_dist = 1                       # distance traveled by missile
         self.warhead_color = warhead_color          # warhead colour
         self.trail_color = trail_color              # missile trail colour
         self.warhead_size = 2                       # warhead display size
         self.trail_width = 1                        # missile trail width
-        self.pos = origin_pos                       # current position of warhead
+        self._pos = origin_pos                      # current position of warhead
         self.x = target_pos[0] - origin_pos[0]      # distance from x origin to x target
         self.y = target_pos[1] - origin_pos[1]      # distance from y origin to y target
         if self.y != 0 :
@@ -28,11 +39,39 @@ class Missile():
         else:
             self.m = 1
         self.angle = math.atan(self.m)              # angle of missile trajectory
+        self.direction = (math.sin(self.angle) * self.incoming,
+                          math.cos(self.angle) * self.incoming)  # unit step along the trajectory
         self.dist_to_target = distance(
                                 origin_pos, 
                                 target_pos)         # full distance to target position
         self.detonated = False                      # has the missile detonated
         self.label = label                          # optional key label for typing mode
+        self.typed_len = 0                          # matched-prefix length, kept by HighlightState
+        self.field = None                           # MissileField holding the motion state, if attached
+        self.slot = None                            # slot in that field
+        self.prefix_tracked = False                 # word registered with the typing systems
+        self.serial = next_serial()                 # changes on reuse, so stale references can be spotted
+
+    # position and travel live in the MissileField arrays while attached
+    @property
+    def pos(self):
+        if self.field is not None:
+            return self.field.coords[self.slot]
+        return self._pos
+
+    @pos.setter
+    def pos(self, value):
+        self._pos = value
+
+    @property
+    def travel_dist(self):
+        if self.field is not None:
+            return float(self.field.travel[self.slot])
+        return self._travel_dist
+
+    @travel_dist.setter
+    def travel_dist(self, value):
+        self._travel_dist = value
         
     # draw the missile and trail
     def draw(self, screen):
@@ -52,25 +91,13 @@ class Missile():
             try:
                 # Show label with typed sequence highlighting
                 full_label = str(self.label).upper()
-                
-                # Get global typed sequence from main module
-                import __main__
-                typed_seq = getattr(__main__, 'typed_sequence', '').upper()
-                
-                # Find if any part of typed sequence matches this word
-                typed_portion = ""
-                if typed_seq:
-                    for i in range(len(typed_seq), 0, -1):
-                        seq_part = typed_seq[-i:]
-                        if full_label.startswith(seq_part):
-                            typed_portion = seq_part
-                            break
+                typed_portion = full_label[:self.typed_len]
                 
                 if len(typed_portion) > 0:
                     # Show typed chars in different color, remaining chars in normal color
-                    typed_surface = game_font.render(typed_portion, False, (0, 255, 0))  # Green for typed
+                    typed_surface = label_cache.render(typed_portion, TYPED_LABEL)  # Green for typed
                     remaining = full_label[len(typed_portion):]
-                    remaining_surface = game_font.render(remaining, False, INTERFACE_SEC)  # Normal color for remaining
+                    remaining_surface = label_cache.render(remaining, INTERFACE_SEC)  # Normal color for remaining
                     
                     # Position both parts
                     total_width = typed_surface.get_width() + remaining_surface.get_width()
@@ -79,40 +106,45 @@ class Missile():
                     screen.blit(remaining_surface, (start_x + typed_surface.get_width(), self.pos[1] - 20))
                 else:
                     # Show normal label
-                    label_surface = game_font.render(full_label, False, INTERFACE_SEC)
+                    label_surface = label_cache.render(full_label, INTERFACE_SEC)
                     screen.blit(label_surface, (self.pos[0] - (label_surface.get_width() // 2), self.pos[1] - 20))
             except Exception:
                 # fail-safe: ignore label draw issues
                 pass
 
-    # update missile logic
-    def update(self, explosion_list):
+    # update missile logic (attached missiles are moved by MissileField.step)
+    def update(self, explosion_list, sound = None):
+        if self.field is not None:
+            return
         if not self.detonated:
-            self.pos = (self.origin_pos[0] + int(self.travel_dist * math.sin(self.angle) * self.incoming), 
-                        self.origin_pos[1] + int(self.travel_dist * math.cos(self.angle) * self.incoming))
+            self.pos = (self.origin_pos[0] + int(self.travel_dist * self.direction[0]), 
+                        self.origin_pos[1] + int(self.travel_dist * self.direction[1]))
             self.travel_dist += self.speed
         # reached target point, now detonate
         if self.travel_dist > self.dist_to_target and not self.detonated:
-            self.explode(explosion_list)
+            self.explode(explosion_list, sound)
     
-    # detonate and create explosion
-    def explode(self, explosion_list):
+    # detonate and create explosion (sound: optional callback taking a sound name)
+    def explode(self, explosion_list, sound = None):
         self.detonated = True
         if self.incoming != 1:
             points_multiplier = 1
             explosion_radius = INTERCEPT_RADIUS
             explosion_color = INTERCEPT_EXPLOSION
-            try:
-                from functions import sfx_intercept
-                sfx_intercept()
-            except Exception:
-                pass
+            if sound is not None:
+                sound('intercept')
+            else:
+                try:
+                    from functions import sfx_intercept
+                    sfx_intercept()
+                except Exception:
+                    pass
         else:
             points_multiplier = 0
             explosion_radius = NUKE_RADIUS
             explosion_color = NUKE_EXPLOSION
 
-        explosion_list.append(Explosion(self.pos, points_multiplier, explosion_radius, explosion_color))
+        explosion_list.append(explosion_pool.acquire(self.pos, points_multiplier, explosion_radius, explosion_color))
 
     # return the current position
     def get_pos(self):
@@ -127,6 +159,10 @@ class Missile():
         if future_dist > self.dist_to_target:
             future_dist = self.dist_to_target
         return (
-            self.origin_pos[0] + int(future_dist * math.sin(self.angle) * self.incoming),
-            self.origin_pos[1] + int(future_dist * math.cos(self.angle) * self.incoming)
+            self.origin_pos[0] + int(future_dist * self.direction[0]),
+            self.origin_pos[1] + int(future_dist * self.direction[1])
         )
+
+
+# shared free-list for incoming warheads and interceptors
+missile_pool = EntityPool(Missile)
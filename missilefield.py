@@ -0,0 +1,108 @@
+try:
+    import numpy as np
+except ImportError:                                 # a requirement; without it missiles fall back to Missile.update
+    np = None
+
+
+class MissileField():
+    """Struct-of-arrays store for missile motion.
+
+    Each missile is attached when it spawns and owns a slot in parallel
+    NumPy arrays (origin, unit direction, travel distance, speed, target
+    distance, detonation flag). step() advances every live missile at once
+    and returns the missiles that reached their target this frame, in the
+    order they were attached, so explosions are created in the same order
+    as the per-object update loop. Positions match Missile.update exactly;
+    coords holds them as Python lists (one tolist() per step) for drawing
+    and collisions.
+    """
+    def __init__(self, capacity = 64):
+        self.capacity = 0
+        self.missiles = []                          # slot -> Missile or None
+        self.free = []                              # unused slots
+        self.attached = 0                           # attach counter, orders same-frame detonations
+        self.coords = []                            # slot -> [x, y] as of the last step (pos.tolist())
+        self._grow(capacity)
+
+    # enlarge every array, keeping existing slots
+    def _grow(self, capacity):
+        old = self.capacity
+        def resize(array, dtype, shape = ()):
+            new = np.zeros((capacity,) + shape, dtype=dtype)
+            if old:
+                new[:old] = array
+            return new
+        self.origin = resize(getattr(self, 'origin', None), np.int64, (2,))
+        self.direction = resize(getattr(self, 'direction', None), np.float64, (2,))
+        self.pos = resize(getattr(self, 'pos', None), np.int64, (2,))
+        self.travel = resize(getattr(self, 'travel', None), np.float64)
+        self.speed = resize(getattr(self, 'speed', None), np.float64)
+        self.dist = resize(getattr(self, 'dist', None), np.float64)
+        self.order = resize(getattr(self, 'order', None), np.int64)
+        self.live = resize(getattr(self, 'live', None), np.bool_)
+        self.missiles.extend([None] * (capacity - old))
+        self.coords.extend([None] * (capacity - old))
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def attach(self, missile):
+        """Move a missile's motion state into a free slot"""
+        if not self.free:
+            self._grow(self.capacity * 2)
+        slot = self.free.pop()
+        self.origin[slot] = missile.origin_pos
+        self.direction[slot] = missile.direction    # angle is fixed, so sin/cos are computed once
+        self.pos[slot] = missile.pos
+        self.travel[slot] = missile.travel_dist
+        self.speed[slot] = missile.speed
+        self.dist[slot] = missile.dist_to_target
+        self.order[slot] = self.attached
+        self.live[slot] = not missile.detonated
+        self.attached += 1
+        self.missiles[slot] = missile
+        self.coords[slot] = list(missile.pos)
+        missile.field = self
+        missile.slot = slot
+
+    def release(self, missile):
+        """Give a missile's slot back (removed from play); its state is copied back first"""
+        if missile.field is not self:
+            return
+        slot = missile.slot
+        missile.field = None
+        missile.slot = None
+        missile.pos = tuple(self.coords[slot])
+        missile.travel_dist = float(self.travel[slot])
+        self.live[slot] = False
+        self.missiles[slot] = None
+        self.coords[slot] = None
+        self.free.append(slot)
+
+    def step(self):
+        """Advance all live missiles one frame; returns those that reached their target"""
+        live = self.live
+        if not live.any():
+            return []
+        # same operations as Missile.update: origin + int(travel * direction)
+        moved = np.trunc(self.travel[live, None] * self.direction[live]).astype(np.int64)
+        self.pos[live] = self.origin[live] + moved
+        self.travel[live] += self.speed[live]
+        self.coords = self.pos.tolist()
+
+        arrived = np.flatnonzero(live & (self.travel > self.dist))
+        if not len(arrived):
+            return []
+        arrived = arrived[np.argsort(self.order[arrived])]
+        self.live[arrived] = False
+        return [self.missiles[slot] for slot in arrived.tolist()]
+
+    def clear(self):
+        """Release every slot (all missiles removed from play)"""
+        for missile in self.missiles:
+            if missile is not None:
+                self.release(missile)
+
+
+def new_missile_field():
+    """A MissileField for a game session, or None when NumPy is not installed"""
+    return MissileField() if np is not None else None
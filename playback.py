@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Fast-forward Replay Playback for KeyBlaster
+
+Re-runs a recorded replay headlessly as fast as the CPU allows: the game
+is re-seeded from the replay's initial seed, every recorded keypress and
+turbo change is fed back in at the game step it happened on, and each
+game's final score and level are checked against its game_over event.
+The state hashes recorded every STATE_HASH_INTERVAL steps are compared as
+well, and the first step window where playback diverged is reported.
+
+Usage:
+  python playback.py <replay_file>          # Replay and verify a specific file
+  python playback.py --latest               # Replay and verify the most recent replay
+"""
+
+import sys
+import os
+import time
+import random
+from config import *
+from session import GameSession
+from rngstreams import seed_streams
+from replay import ReplayPlayer, get_replay_directory
+
+
+class FastForward():
+    """Drives a GameSession from a replay's events instead of a player.
+
+    Keypresses and speed changes carry the number of steps the game had
+    run when they happened; the session is stepped up to that number and
+    the input applied, exactly as the live game loop did. Rendering and
+    audio are skipped, which cannot change the outcome because they draw
+    from their own random streams (rngstreams.py).
+    """
+    def __init__(self, events, seed):
+        self.events = events
+        self.seed = seed
+        self.session = None
+        self.games = []                             # one result dict per game played
+        self.diverged = False                       # recorded input outlived the replayed game
+        self.hashes = {}                            # (game, step) -> state hash seen in playback
+
+    def run(self):
+        """Play every game in the replay; returns the list of game results"""
+        random.seed(self.seed)
+        seed_streams(self.seed)
+        self.session = GameSession(0)
+        self.games = []
+        self.diverged = False
+        self.hashes = {}
+        for event in self.events:
+            data = event["data"]
+            if event["type"] == "keypress":
+                self._advance(data["frame"])
+                if data.get("char"):
+                    self.session.type_key(data["char"].lower())
+            elif event["type"] == "speed":
+                self._advance(data["frame"])
+                self.session.clock.set_speed(data["speed"])
+            elif event["type"] == "state_hash":
+                self._advance(data["frame"])
+            elif event["type"] == "game_over":
+                self._advance(data.get("frame"))
+                self._finish_game(data)
+                self.session.reset()
+        if self.session.frame:
+            self._finish_game(None)                 # recording ended mid-game
+        return self.games
+
+    # step the session until it has run `frame` steps (or, with no frame, until the game is over)
+    def _advance(self, frame):
+        session = self.session
+        while frame is None or session.frame < frame:
+            state = session.step()
+            if session.frame % STATE_HASH_INTERVAL == 0:
+                self.hashes[(len(self.games), session.frame)] = session.state_hash
+            if state == GAME_STATE_NEW_LEVEL:
+                session.start_next_level()
+            elif state == GAME_STATE_OVER:
+                break
+        if frame is not None and session.frame < frame:
+            self.diverged = True                    # recorded input continues after our game ended
+
+    def _finish_game(self, recorded):
+        session = self.session
+        result = {
+            "score": session.get_score(),
+            "level": session.get_level(),
+            "frames": session.frame,
+            "game_over": session.state == GAME_STATE_OVER,
+            "recorded_score": None,
+            "recorded_level": None,
+            "match": None,
+        }
+        if recorded is not None:
+            result["recorded_score"] = recorded.get("final_score")
+            result["recorded_level"] = recorded.get("level")
+            result["match"] = (not self.diverged and result["game_over"]
+                               and result["score"] == result["recorded_score"]
+                               and result["recorded_level"] in (None, result["level"]))
+        self.games.append(result)
+        self.diverged = False
+
+
+def recorded_hashes(events):
+    """[(game, step, hash)] for every state hash in a replay, in order"""
+    hashes = []
+    game = 0
+    for event in events:
+        if event["type"] == "state_hash":
+            hashes.append((game, event["data"]["frame"], event["data"]["hash"]))
+        elif event["type"] == "game_over":
+            game += 1
+    return hashes
+
+
+def find_desync(recorded, played):
+    """First recorded (game, step, hash) that playback did not reproduce, or None
+
+    Hashes roll, so within a game a divergence shows in every later hash:
+    the first game whose last hash differs is found, then bisected.
+    """
+    for game in sorted(set(entry[0] for entry in recorded)):
+        checks = [entry for entry in recorded if entry[0] == game]
+        def differs(i):
+            return played.get(checks[i][:2]) != checks[i][2]
+        if not differs(len(checks) - 1):
+            continue
+        low, high = 0, len(checks) - 1              # checks[high] is known to differ
+        while low < high:
+            middle = (low + high) // 2
+            if differs(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return checks[low]
+    return None
+
+
+def game_events(events, game):
+    """The events of one game (counted from 0) in a replay"""
+    current = 0
+    for event in events:
+        if current == game:
+            yield event
+        if event["type"] == "game_over":
+            current += 1
+
+
+def has_frame_numbers(events):
+    """Were the keypresses recorded with game step numbers (needed for playback)"""
+    keys = [e for e in events if e["type"] == "keypress"]
+    return all(e["data"].get("frame") is not None for e in keys)
+
+
+def play_replay(filename):
+    """Fast-forward one replay file and print the result; returns True if every game matched"""
+    player = ReplayPlayer(filename)
+    if not player.load():
+        return False
+    if player.initial_seed is None or not has_frame_numbers(player.events):
+        print("This replay was recorded without seed or frame numbers and cannot be played back.")
+        return False
+
+    started = time.time()
+    playback = FastForward(player.events, player.initial_seed)
+    games = playback.run()
+    elapsed = time.time() - started
+
+    frames = sum(game["frames"] for game in games)
+    print(f"Played {len(games)} game(s), {frames} steps ({frames / FPS:.0f}s of game time) in {elapsed:.2f}s")
+    ok = True
+    for i, game in enumerate(games, 1):
+        line = f"  Game {i}: score {game['score']}  level {game['level']}"
+        if game["match"] is None:
+            line += "  (no game_over recorded; not verified)"
+        elif game["match"]:
+            line += "  OK"
+        else:
+            ok = False
+            line += f"  MISMATCH (recorded score {game['recorded_score']}, level {game['recorded_level']})"
+        print(line)
+
+    recorded = recorded_hashes(player.events)
+    if recorded:
+        desync = find_desync(recorded, playback.hashes)
+        if desync is None:
+            print(f"State hashes: all {len(recorded)} match")
+        else:
+            ok = False
+            game, step, value = desync
+            first = max(0, step - STATE_HASH_INTERVAL)
+            print(f"DESYNC in game {game + 1}: state first differs between step {first} and step {step}")
+            keys = [e["data"].get("char") for e in game_events(player.events, game)
+                    if e["type"] == "keypress" and first <= e["data"]["frame"] < step]
+            print(f"  Keys recorded in that window: {keys}")
+    return ok
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python playback.py <replay_file|--latest>")
+        return
+
+    filename = sys.argv[1]
+    if filename == "--latest":
+        from view_replay import get_latest_replay
+        filename = get_latest_replay()
+        if not filename:
+            print("No replay files found.")
+            return
+    elif not os.path.exists(filename) and not os.path.isabs(filename):
+        full_path = os.path.join(get_replay_directory(), filename)
+        if os.path.exists(full_path):
+            filename = full_path
+
+    sys.exit(0 if play_replay(filename) else 1)
+
+
+if __name__ == '__main__':
+    main()
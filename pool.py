@@ -0,0 +1,55 @@
+import itertools
+
+_serials = itertools.count(1)
+
+def next_serial():
+    """Unique number for each (re)use of a pooled entity; 0 means released"""
+    return next(_serials)
+
+
+class EntityPool():
+    """Free-list of reusable entity objects.
+
+    acquire() hands out a released object re-initialised with reset(), or
+    builds a new one when the free-list is empty. Counters show how many
+    objects were ever built, so steady-state play should stop creating
+    any once the free-list has warmed up.
+    """
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0                            # objects built with cls(...)
+        self.reused = 0                             # acquires served from the free-list
+        self.released = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            entity = self.cls(*args, **kwargs)
+            self.created += 1
+        return entity
+
+    def release(self, entity):
+        """Return an entity that has left play; stale references see serial 0"""
+        if entity.serial == 0:
+            return                                  # already released
+        entity.serial = 0
+        self.free.append(entity)
+        self.released += 1
+
+    def release_all(self, entities):
+        """Release every entity in a list and empty it"""
+        for entity in entities:
+            self.release(entity)
+        entities.clear()
+
+    def get_stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "free": len(self.free),
+        }
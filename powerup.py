@@ -1,9 +1,21 @@
 import pygame
-import random
+from rngstreams import powerup_rng
 from config import *
+from labelcache import label_cache
+from wordpool import get_risky_pool
+from pool import EntityPool, next_serial
+
+_TRAIL_SURFACES = {}    # alpha -> faded trail segment, built once
 
 class Powerup():
-    def __init__(self, start_side="left"):
+    __slots__ = ('size', 'width', 'height', 'color', 'trail_color', 'speed', 'pos', 'direction',
+                 'destroyed', 'points', 'label', 'typed_len', 'flash_timer', 'prefix_tracked', 'serial')
+
+    def __init__(self, start_side="left", active_prefixes=()):
+        self.reset(start_side, active_prefixes)
+
+    # (re)initialise every field; pooled powerups are reset instead of rebuilt
+    def reset(self, start_side="left", active_prefixes=()):
         # Spaceship appearance - different from missiles
         self.size = 15
         self.width = 40
@@ -19,57 +31,29 @@ class Powerup():
         max_y = SCREENSIZE[1] - GROUND_LEVEL - 100  # Stay well above cities/ground
         
         if start_side == "left":
-            self.pos = [-self.width, random.randint(min_y, max_y)]  # Start left of screen
+            self.pos = [-self.width, powerup_rng.randint(min_y, max_y)]  # Start left of screen
             self.direction = 1  # Moving right
         else:
-            self.pos = [SCREENSIZE[0] + self.width, random.randint(min_y, max_y)]  # Start right of screen
+            self.pos = [SCREENSIZE[0] + self.width, powerup_rng.randint(min_y, max_y)]  # Start right of screen
             self.direction = -1  # Moving left
         
         self.destroyed = False
         self.points = 1000  # Base points for powerup
         
         # Hard word selection
-        self.label = self._choose_hard_word()
+        self.label = self._choose_hard_word(active_prefixes)
+        self.typed_len = 0  # matched-prefix length, kept by HighlightState
         
         # Visual effects
         self.flash_timer = 0
         
-    def _choose_hard_word(self):
-        # Import conflict checking functions from main module
-        import __main__
-        can_add_word = getattr(__main__, 'can_add_word', lambda x: True)
-        
-        # RISKY words - intentionally difficult to type quickly
-        # Mix of uncommon words, tricky spelling, and awkward finger combinations
-        risky_words = [
-            # Tricky finger combinations
-            "zyx", "qaz", "wsx", "xqz", "jkl", "mnb", "zxc",
-            # Challenging 4-5 letter words with difficult patterns
-            "lynx", "jinx", "quiz", "fizz", "fuzz", "jazz", "buzz", "whiz",
-            # Gen Alpha risky shorthand (tricky to type quickly)
-            "periodt", "whatev", "istg", "tbh", "irl", "rn", "nvm", "ttyl", "brb", "smh",
-            # 6-7 letter risky words
-            "zygote", "rhythm", "psycho", "sphinx", "fjords", "glyph", "nymph",
-            # Gen Alpha longer terms (risky because unfamiliar)
-            "snatched", "pressed", "cappin", "ghosted", "bussin", "slayed",
-            # 8+ letter high-risk words (long = more time vulnerable)
-            "xylophone", "zephyr", "syzygy", "byzantine", "schizoid", "rhapsody",
-            "labyrinth", "synchrony", "toxicity", "xerophyte"
-        ]
-        
-        # Try to find a word without conflicts
-        for _ in range(50):  # Max attempts
-            word = random.choice(risky_words)
-            if can_add_word(word):
-                return word
+        self.prefix_tracked = False  # word registered with the typing systems
+        self.serial = next_serial()  # changes on reuse, so stale references can be spotted
         
-        # Fallback: try each word in order
-        for word in risky_words:
-            if can_add_word(word):
-                return word
-                
-        # Last resort: return any word
-        return random.choice(risky_words)
+    def _choose_hard_word(self, active_prefixes=()):
+        # active_prefixes: prefixes of words already on screen, to avoid conflicts
+        # RISKY words - intentionally difficult to type quickly (see wordpool.RISKY_WORDS)
+        return get_risky_pool().choose(active_prefixes, powerup_rng)
     
     def update(self):
         if not self.destroyed:
@@ -112,9 +96,12 @@ class Powerup():
                 trail_x = self.pos[0] - (self.direction * (i * 8))
                 trail_alpha = 255 - (i * 50)
                 if trail_alpha > 0:
-                    trail_surface = pygame.Surface((6, 3))
-                    trail_surface.set_alpha(trail_alpha)
-                    trail_surface.fill(self.trail_color)
+                    trail_surface = _TRAIL_SURFACES.get(trail_alpha)
+                    if trail_surface is None:
+                        trail_surface = pygame.Surface((6, 3))
+                        trail_surface.set_alpha(trail_alpha)
+                        trail_surface.fill(self.trail_color)
+                        _TRAIL_SURFACES[trail_alpha] = trail_surface
                     screen.blit(trail_surface, (trail_x, self.pos[1] + self.height // 2))
             
             # Draw the word label above spaceship
@@ -124,25 +111,13 @@ class Powerup():
                     full_label = str(self.label).upper()
                     
                     label_y = self.pos[1] - 25
-                    
-                    # Get global typed sequence from main module
-                    import __main__
-                    typed_seq = getattr(__main__, 'typed_sequence', '').upper()
-                    
-                    # Find if any part of typed sequence matches this word
-                    typed_portion = ""
-                    if typed_seq:
-                        for i in range(len(typed_seq), 0, -1):
-                            seq_part = typed_seq[-i:]
-                            if full_label.startswith(seq_part):
-                                typed_portion = seq_part
-                                break
+                    typed_portion = full_label[:self.typed_len]
                     
                     if len(typed_portion) > 0:
                         # Show typed chars in different color, remaining chars in normal color
-                        typed_surface = game_font.render(typed_portion, False, (0, 255, 0))  # Green for typed
+                        typed_surface = label_cache.render(typed_portion, TYPED_LABEL)  # Green for typed
                         remaining = full_label[len(typed_portion):]
-                        remaining_surface = game_font.render(remaining, False, (255, 255, 255))  # White for remaining
+                        remaining_surface = label_cache.render(remaining, (255, 255, 255))  # White for remaining
                         
                         # Position both parts
                         total_width = typed_surface.get_width() + remaining_surface.get_width()
@@ -151,7 +126,7 @@ class Powerup():
                         screen.blit(remaining_surface, (start_x + typed_surface.get_width(), label_y))
                     else:
                         # Show normal label
-                        label_surface = game_font.render(full_label, False, (255, 255, 255))
+                        label_surface = label_cache.render(full_label, (255, 255, 255))
                         screen.blit(label_surface, (self.pos[0] + self.width // 2 - (label_surface.get_width() // 2), label_y))
                 except Exception:
                     # fail-safe: ignore label draw issues
@@ -165,4 +140,8 @@ class Powerup():
     
     def destroy(self):
         self.destroyed = True
-        return self.points
\ No newline at end of file
+        return self.points
+
+
+# shared free-list for powerup ships
+powerup_pool = EntityPool(Powerup)
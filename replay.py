@@ -1,9 +1,16 @@
 import json
 import time
 import random
+from rngstreams import seed_streams
 import pygame
 import os
+import glob
+import queue
+import threading
+import collections
 from datetime import datetime
+from config import REPLAY_JOURNAL_BATCH, REPLAY_QUEUE_SIZE, REPLAY_MAX_PENDING, REPLAY_SUMMARY_TAIL, REPLAY_EXTENSION, KEYFRAME_INTERVAL, SEEK_INTERVAL, REPLAY_CATALOG
+from replayformat import new_encoder, iter_replay_file, is_binary_replay, ReplayIndex, index_filename, index_entry, INDEX_HEADER, INDEX_MAGIC, INDEX_VERSION, ReplayCatalog
 
 def get_replay_directory():
     """Get or create the replay directory in %APPDATA%"""
@@ -15,17 +22,361 @@ def get_replay_directory():
     
     return replay_dir
 
+def find_replays(replay_dir):
+    """Paths of every replay file in a directory (binary, journal or JSON)"""
+    files = []
+    for pattern in ("replay_*.kbr", "replay_*.jsonl", "replay_*.json"):
+        files.extend(glob.glob(os.path.join(replay_dir, pattern)))
+    return files
+
+def catalog_path(replay_dir):
+    """The catalog file of a replay directory"""
+    return os.path.join(replay_dir, REPLAY_CATALOG)
+
+def read_catalog(replay_dir):
+    """Catalog entries for a replay directory, oldest recording first
+
+    Only the catalog is read; a directory without one (replays recorded
+    before catalogs existed) gets one built by rebuild_catalog().
+    """
+    if not os.path.exists(catalog_path(replay_dir)):
+        return rebuild_catalog(replay_dir)
+    catalog = ReplayCatalog(catalog_path(replay_dir))
+    try:
+        return catalog.entries()
+    finally:
+        catalog.close()
+
+def rebuild_catalog(replay_dir):
+    """Rewrite a directory's catalog from its replay files (reads each one); returns the entries"""
+    entries = []
+    for path in find_replays(replay_dir):
+        try:
+            entries.append(scan_replay(path))
+        except Exception as e:
+            print(f"Skipping unreadable replay {os.path.basename(path)}: {e}")
+    entries.sort(key=lambda entry: entry["start_time"])
+    catalog = ReplayCatalog(catalog_path(replay_dir), check=False)
+    try:
+        catalog.rewrite(entries)                    # in place, under the catalog's lock: games may be recording
+    finally:
+        catalog.close()
+    return entries
+
+def scan_replay(filename):
+    """A replay's catalog entry, worked out by reading the whole file"""
+    if filename.endswith('.jsonl') or is_binary_replay(filename):
+        header = {}
+        stats = ReplayStats(filename, None)
+        for kind, value in iter_replay_file(filename):
+            if kind == "header":
+                header = value
+            elif kind == "event":
+                stats.add(value)
+        start_time = header.get("start_time")
+    else:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        stats = ReplayStats(filename, None)
+        for event in data.get("events", []):
+            stats.add(event)
+        start_time = data.get("start_time")
+    stats.entry["start_time"] = start_time if start_time is not None else os.path.getmtime(filename)
+    stats.entry["size"] = os.path.getsize(filename)
+    return stats.entry
+
+def latest_replay(replay_dir):
+    """Path of the most recently started replay in a directory (found through its catalog), or None"""
+    for entry in reversed(read_catalog(replay_dir)):
+        path = os.path.join(replay_dir, entry["name"])
+        if os.path.exists(path):
+            return path
+    return None
+
 def get_timestamp_filename():
     """Generate a Windows-compatible timestamp filename"""
     # Use format: YYYY-MM-DD_HH-MM-SS (Windows compatible)
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    return f"replay_{timestamp}.json"
+    return f"replay_{timestamp}{REPLAY_EXTENSION}"
+
+class DebugSummary:
+    """AI-friendly debug annotations, kept up to date one event at a time.
+
+    add() is O(1) per event: keystroke trigrams are counted as keys
+    arrive, so result() never rescans the keystroke history. Only the last
+    REPLAY_SUMMARY_TAIL keystrokes and word matches are kept for the
+    summary (the replay's events hold all of them), so memory and result()
+    don't grow with the length of the game.
+    """
+    def __init__(self):
+        self.event_count = 0
+        self.last_time = 0
+        self.keypresses = 0
+        self.keystroke_length = 0                   # characters in the keystroke sequence
+        self.keystroke_tail = collections.deque(maxlen=REPLAY_SUMMARY_TAIL)    # its last characters
+        self.last_chars = ""                        # last two characters typed, to form trigrams
+        self.trigrams = {}                          # 3-character window -> times seen, not overlapping
+        self.trigram_ends = {}                      # 3-character window -> end of its last counted match
+        self.trigram_starts = {}                    # 3-character window -> where it first appears
+        self.repeated = []                          # trigrams seen 3 or more times
+        self.word_matches = collections.deque(maxlen=REPLAY_SUMMARY_TAIL)      # most recent successful matches
+        self.matched_words = set()                  # lowercased successful matches
+        self.failed_matches = collections.deque(maxlen=REPLAY_SUMMARY_TAIL)
+        self.level_changes = []
+        self.last_state = None
+        self.snapshots = SnapshotTracker()          # game_state events may be deltas
+
+    def add(self, event):
+        self.event_count += 1
+        self.last_time = event["time"]
+        if event["type"] == "keypress":
+            char = event["data"].get("char", "")
+            self.keypresses += 1
+            self.keystroke_tail.extend(char)
+            for c in char:
+                window = self.last_chars + c
+                start = self.keystroke_length - 2       # where the window begins in the keystroke sequence
+                self.keystroke_length += 1
+                # non-overlapping matches, as str.count counts them ("aaaaa" holds 'aaa' once)
+                if len(window) == 3 and start >= self.trigram_ends.get(window, 0):
+                    self.trigram_ends[window] = start + 3
+                    count = self.trigrams.get(window, 0) + 1
+                    self.trigrams[window] = count
+                    if count == 1:
+                        self.trigram_starts[window] = start
+                    elif count == 3:
+                        self.repeated.append(window)
+                self.last_chars = window[-2:]
+        elif event["type"] == "word_match":
+            if event["data"]["success"]:
+                self.word_matches.append(event["data"]["word"])
+                self.matched_words.add(event["data"]["word"].lower())
+            else:
+                self.failed_matches.append(event["data"]["word"])
+        elif event["type"] == "game_state":
+            self.last_state = self.snapshots.apply(event["data"])
+        elif event["type"] == "level_change":
+            self.level_changes.append(event["data"]["level"])
+
+    def result(self):
+        """The summary for every event added so far"""
+        if not self.event_count:
+            return {"error": "No events recorded"}
+
+        # Find potential issues
+        issues = []
+
+        # Look for repeated failed keystrokes
+        if self.keystroke_length > 10:
+            for window in sorted(self.repeated, key=self.trigram_starts.get):
+                issues.append(f"Repeated keystroke pattern: '{window}'")
+
+        # Look for available words that weren't matched
+        if self.last_state:
+            last_state = self.last_state
+            available_words = []
+            for missile in last_state.get("missiles", []):
+                available_words.append(missile["label"].lower())
+            for powerup in last_state.get("powerups", []):
+                available_words.append(powerup["label"].lower())
+
+            # Check if typed sequence could form available words
+            typed_seq = last_state.get("typed_sequence", "").lower()
+            if typed_seq and available_words:
+                for word in available_words:
+                    if all(char in typed_seq for char in word):
+                        if word not in self.matched_words:
+                            issues.append(f"Available word '{word}' not matched despite having all letters in sequence '{typed_seq}'")
+
+        return {
+            "session_duration": self.last_time,
+            "total_keystrokes": self.keypresses,
+            "keystroke_sequence": ("..." if self.keystroke_length > len(self.keystroke_tail) else "") + "".join(self.keystroke_tail),
+            "successful_matches": list(self.word_matches),
+            "failed_matches": list(self.failed_matches),
+            "levels_reached": list(self.level_changes),
+            "final_game_state": self.last_state,
+            "potential_issues": issues,
+            "common_debugging_hints": {
+                "word_matching": "Check if keystroke sequence contains all letters for available words",
+                "prefix_conflicts": "Look for words with same 2-letter prefix causing conflicts",
+                "sequence_reset": "Check if typed sequence is being reset when it shouldn't be",
+                "timing_issues": "Look for rapid keystrokes that might be processed out of order"
+            }
+        }
+
+class ReplayStats:
+    """A replay's catalog entry (see replayformat.py), kept up to date one event at a time"""
+    def __init__(self, filename, start_time):
+        self.entry = {
+            "name": os.path.basename(filename),
+            "start_time": start_time,
+            "duration": 0.0,
+            "size": 0,
+            "events": 0,
+            "final_score": 0,
+            "max_level": 0,
+        }
+
+    def add(self, event):
+        entry = self.entry
+        entry["events"] += 1
+        entry["duration"] = max(entry["duration"], event["time"])
+        data = event["data"]
+        if not isinstance(data, dict):
+            return
+        if isinstance(data.get("level"), int):
+            entry["max_level"] = max(entry["max_level"], data["level"])
+        if event["type"] == "game_state" and isinstance(data.get("score"), int):
+            entry["final_score"] = data["score"]
+        elif event["type"] == "game_over" and isinstance(data.get("final_score"), int):
+            entry["final_score"] = data["final_score"]
+
+class SnapshotTracker:
+    """Rebuilds complete game_state snapshots from recorded keyframes and deltas.
+
+    apply() takes each recorded game_state in order (keyframe, delta, or
+    the older full snapshot format) and returns the whole state it stands
+    for: missiles, powerups, typed_sequence, level, score and frame.
+    """
+    def __init__(self):
+        self.entities = {"missiles": {}, "powerups": {}}   # id -> {"id", "label", "pos"}
+        self.fields = {}
+
+    def apply(self, data):
+        if data.get("keyframe") or isinstance(data.get("missiles"), list):
+            # keyframe, or an older full snapshot (entities without ids are keyed by position in the list)
+            self.entities = {key: {entry.get("id", i): dict(entry) for i, entry in enumerate(data.get(key, []))}
+                             for key in ("missiles", "powerups")}
+            self.fields = {}
+        for name in ("typed_sequence", "level", "score"):
+            if name in data:
+                self.fields[name] = data[name]
+        for key in ("missiles", "powerups"):
+            change = data.get(key)
+            if not isinstance(change, dict):
+                continue
+            entities = self.entities[key]
+            for i in change.get("removed", []):
+                entities.pop(i, None)
+            for entry in change.get("added", []):
+                entities[entry["id"]] = dict(entry)
+            for entry in change.get("moved", []):
+                if entry["id"] in entities:
+                    entities[entry["id"]]["pos"] = entry["pos"]
+        state = {
+            "missiles": [dict(entry) for entry in self.entities["missiles"].values()],
+            "powerups": [dict(entry) for entry in self.entities["powerups"].values()],
+        }
+        state.update(self.fields)
+        if "frame" in data:
+            state["frame"] = data["frame"]
+        return state
+
+def generate_debug_summary(events):
+    """Generate AI-friendly debug annotations for a list of events"""
+    summary = DebugSummary()
+    for event in events:
+        summary.add(event)
+    return summary.result()
+
+def load_replay(filename):
+    """Load a replay as today's JSON document, whatever format it was saved in
+
+    Binary replays (.kbr) and journals (.jsonl) are decoded, with their
+    delta game_state snapshots rebuilt into complete ones; older replays
+    are single JSON documents. A replay without its summary trailer (the
+    game crashed) gets the summary computed from its events.
+    """
+    if not filename.endswith('.jsonl') and not is_binary_replay(filename):
+        with open(filename, 'r') as f:
+            return json.load(f)
+
+    header = {}
+    events = []
+    summary = None
+    for kind, value in iter_replay(filename):
+        if kind == "header":
+            header = value
+        elif kind == "summary":
+            summary = value
+        else:
+            events.append(value)
+    initial_seed = header.get("initial_seed")
+    for event in events:
+        if initial_seed is None and event["type"] == "seed":
+            initial_seed = event["data"]["value"]
+    if summary is None:
+        summary = generate_debug_summary(events)
+    return {
+        "version": header.get("version", "1.1"),
+        "start_time": header.get("start_time"),
+        "initial_seed": initial_seed,
+        "events": events,
+        "ai_debug_info": summary
+    }
+
+def iter_replay(filename, offset=None):
+    """Yield ("header"|"summary"|"event", value) from any replay file, game_state snapshots rebuilt to complete ones
+
+    Binary replays and journals are read a piece at a time, so memory
+    stays bounded however long they are; reading starts at the beginning,
+    or at a keyframe offset from the seek index. Older .json replays are
+    single documents and are loaded whole.
+    """
+    if not filename.endswith('.jsonl') and not is_binary_replay(filename):
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        yield "header", {name: data.get(name) for name in ("version", "start_time", "initial_seed")}
+        for event in data.get("events", []):
+            yield "event", event
+        if data.get("ai_debug_info") is not None:
+            yield "summary", data["ai_debug_info"]
+        return
+    snapshots = SnapshotTracker()
+    for kind, value in iter_replay_file(filename, offset):
+        if kind == "event" and value["type"] == "game_state":
+            value["data"] = snapshots.apply(value["data"])
+        yield kind, value
+
+def iter_replay_events(filename, offset=None):
+    """Yield a replay's events one at a time (see iter_replay)"""
+    for kind, value in iter_replay(filename, offset):
+        if kind == "event":
+            yield value
+
+def export_json(filename, output=None):
+    """Convert a binary replay or journal into a whole-file JSON replay; returns the output path"""
+    output = output or os.path.splitext(filename)[0] + ".json"
+    replay = load_replay(filename)                  # read first: a damaged replay leaves no half-written output
+    with open(output, 'w') as f:
+        json.dump(replay, f, indent=2)
+    return output
 
 class ReplayRecorder:
+    """Records a game's events to an append-only replay file.
+
+    Events are buffered in batches of REPLAY_JOURNAL_BATCH and appended by
+    a writer thread fed through a bounded queue, so recording and saving
+    never wait on the disk and a crash loses at most the unwritten
+    batches. The file format follows the extension (see replayformat.py).
+    The writer also appends the byte offsets of keyframes to the seek
+    index (<replay>.idx) used by ReplayPlayer.seek(), and keeps this
+    replay's entry in the directory's catalog up to date. close() adds the debug
+    summary as a trailer; load_replay() turns any replay file back into
+    the whole-file JSON format.
+    """
     def __init__(self, filename=None):
-        self.events = []
+        self.summary = DebugSummary()               # kept up to date as events are recorded
+        self.snapshot_entities = None               # last game_state snapshot: key -> {serial: (label, pos)}
+        self.snapshot_fields = None
+        self.snapshot_frame = None
+        self.snapshot_count = 0
         self.start_time = time.time()
         self.initial_seed = None
+        self.pending = []                           # events not yet handed to the writer thread
+        self.queue = queue.Queue(maxsize=REPLAY_QUEUE_SIZE)    # ("events"|"summary"|"close", payload)
+        self.closed = False
         
         if filename:
             self.filename = filename
@@ -35,6 +386,8 @@ class ReplayRecorder:
             self.filename = os.path.join(replay_dir, timestamp_name)
         
         self.recording = True
+        self.writer = threading.Thread(target=self._write_loop, name="replay-writer", daemon=True)
+        self.writer.start()
         
     def set_initial_seed(self, seed):
         """Record the initial random seed for deterministic replay"""
@@ -52,41 +405,78 @@ class ReplayRecorder:
             "type": event_type,
             "data": data
         }
-        self.events.append(event)
+        self.summary.add(event)
+        self.pending.append(event)
+        if len(self.pending) >= REPLAY_JOURNAL_BATCH:
+            self.flush()
     
-    def record_keypress(self, key_char, pygame_key):
-        """Record a key press event"""
+    def record_keypress(self, key_char, pygame_key, frame=None):
+        """Record a key press event; frame is the number of game steps run before it"""
         self.record_event("keypress", {
             "char": key_char,
             "key": pygame_key,
-            "unicode": key_char
+            "unicode": key_char,
+            "frame": frame
         })
+
+    def record_state_hash(self, frame, state_hash):
+        """Record the game's rolling state hash after the given step"""
+        self.record_event("state_hash", {"frame": frame, "hash": state_hash})
+
+    def record_speed(self, frame, speed):
+        """Record a change of game speed (turbo) from the given step on"""
+        self.record_event("speed", {"frame": frame, "speed": speed})
     
-    def record_game_state(self, missiles, powerups, typed_sequence, level, score):
-        """Record current game state for verification"""
-        missile_data = []
-        for m in missiles:
-            if hasattr(m, 'label') and m.label:
-                missile_data.append({
-                    "label": m.label,
-                    "pos": list(m.pos) if hasattr(m, 'pos') else [0, 0]
-                })
-        
-        powerup_data = []
-        for p in powerups:
-            if hasattr(p, 'label') and p.label:
-                powerup_data.append({
-                    "label": p.label,
-                    "pos": list(p.pos) if hasattr(p, 'pos') else [0, 0]
-                })
-        
-        self.record_event("game_state", {
-            "missiles": missile_data,
-            "powerups": powerup_data,
-            "typed_sequence": typed_sequence,
-            "level": level,
-            "score": score
-        })
+    def record_game_state(self, missiles, powerups, typed_sequence, level, score, frame=None):
+        """Record the game state for verification, as a keyframe or as the changes since the last one
+
+        Every KEYFRAME_INTERVAL-th snapshot (and the first of each
+        game) is a keyframe holding every labelled missile and powerup;
+        the others hold only what was added, moved or removed (by entity
+        serial) and the fields that changed. SnapshotTracker rebuilds them.
+        """
+        entities = {}
+        for key, objects in (("missiles", missiles), ("powerups", powerups)):
+            entities[key] = {getattr(obj, 'serial', id(obj)): (obj.label, list(obj.pos))
+                             for obj in objects if getattr(obj, 'label', None)}
+        fields = {"typed_sequence": typed_sequence, "level": level, "score": score}
+
+        new_game = frame is not None and self.snapshot_frame is not None and frame < self.snapshot_frame
+        keyframe = self.snapshot_entities is None or new_game or self.snapshot_count % KEYFRAME_INTERVAL == 0
+        if new_game:
+            self.snapshot_count = 0
+        data = {} if frame is None else {"frame": frame}
+        if keyframe:
+            data["keyframe"] = True
+            data.update(fields)
+            for key, current in entities.items():
+                data[key] = [{"id": i, "label": label, "pos": pos} for i, (label, pos) in current.items()]
+        else:
+            for name, value in fields.items():
+                if self.snapshot_fields[name] != value:
+                    data[name] = value
+            for key, current in entities.items():
+                previous = self.snapshot_entities[key]
+                change = {}
+                added = [{"id": i, "label": label, "pos": pos} for i, (label, pos) in current.items()
+                         if i not in previous or previous[i][0] != label]
+                moved = [{"id": i, "pos": pos} for i, (label, pos) in current.items()
+                         if i in previous and previous[i][0] == label and previous[i][1] != pos]
+                removed = [i for i in previous if i not in current]
+                if added:
+                    change["added"] = added
+                if moved:
+                    change["moved"] = moved
+                if removed:
+                    change["removed"] = removed
+                if change:
+                    data[key] = change
+
+        self.snapshot_entities = entities
+        self.snapshot_fields = fields
+        self.snapshot_frame = frame
+        self.snapshot_count += 1
+        self.record_event("game_state", data)
     
     def record_word_match(self, word, target_type, success):
         """Record word matching attempts"""
@@ -100,104 +490,112 @@ class ReplayRecorder:
         """Record level transitions"""
         self.record_event("level_change", {"level": new_level})
     
-    def save(self):
-        """Save replay to file with AI debug annotations"""
-        # Generate AI-friendly debug summary
-        debug_summary = self._generate_debug_summary()
-        
-        replay_data = {
-            "version": "1.0",
-            "start_time": self.start_time,
-            "initial_seed": self.initial_seed,
-            "events": self.events,
-            "ai_debug_info": debug_summary
-        }
-        
+    def flush(self, block=False):
+        """Hand the pending events to the writer thread
+
+        Backpressure: when the writer's queue is full the events stay
+        pending and go with the next batch, so the game never waits on the
+        disk; only once REPLAY_MAX_PENDING events are held back (or with
+        block=True) does this wait for room. Returns True if handed over.
+        """
+        if not self.pending:
+            return True
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(replay_data, f, indent=2)
-            print(f"Replay saved to {self.filename}")
+            self.queue.put(("events", self.pending), block=block or len(self.pending) >= REPLAY_MAX_PENDING)
+        except queue.Full:
+            return False
+        self.pending = []
+        return True
+
+    def save(self):
+        """Queue everything recorded so far for the journal; returns the replay filename"""
+        self.flush()
+        return self.filename
+
+    def close(self):
+        """Write out every event and the debug summary trailer, then stop the writer thread"""
+        if self.closed:
             return self.filename
-        except Exception as e:
-            print(f"Failed to save replay: {e}")
-            return None
+        self.closed = True
+        self.flush(block=True)
+        self.queue.put(("summary", self._generate_debug_summary()))
+        self.queue.put(("close", None))
+        self.writer.join()
+        print(f"Replay saved to {self.filename}")
+        return self.filename
+
+    # writer thread: appends queued batches to the replay file until closed
+    def _write_loop(self):
+        journal = None
+        index = None
+        catalog = None
+        stats = ReplayStats(self.filename, self.start_time)
+        encoder = new_encoder(self.filename, SEEK_INTERVAL)
+        while True:
+            kind, payload = self.queue.get()
+            if kind == "close":
+                break
+            try:
+                if journal is None:
+                    journal = open(self.filename, 'ab')
+                    journal.write(encoder.file_header() + encoder.header(self.start_time, self.initial_seed))
+                    journal.flush()
+                    catalog, slot = self._open_catalog(stats.entry)     # listed only once the file exists
+                if kind == "events":
+                    offset = journal.tell()
+                    journal.write(encoder.events(payload))
+                    for event in payload:
+                        stats.add(event)
+                else:
+                    journal.write(encoder.summary(payload))
+                journal.flush()
+                if kind == "events" and encoder.keyframes:
+                    # index entries only once the data they point at is written
+                    entries = b"".join(index_entry(offset + position, game, event)
+                                       for position, game, event in encoder.keyframes)
+                    if index is None:
+                        index = open(index_filename(self.filename), 'ab')
+                        if index.tell() == 0:
+                            index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION))
+                    index.write(entries)
+                    index.flush()
+                if catalog is not None:
+                    stats.entry["size"] = journal.tell()
+                    slot = catalog.update(slot, stats.entry)
+            except Exception as e:
+                print(f"Failed to save replay: {e}")
+        if journal is not None:
+            journal.close()
+        if index is not None:
+            index.close()
+        if catalog is not None:
+            catalog.close()
+
+    # writer thread: add this replay to its directory's catalog; returns (catalog, slot), or (None, None) if unusable
+    def _open_catalog(self, entry):
+        replay_dir = os.path.dirname(self.filename) or '.'
+        try:
+            if not os.path.exists(catalog_path(replay_dir)):
+                rebuild_catalog(replay_dir)         # first recording with a catalog: list the replays already there
+            catalog = ReplayCatalog(catalog_path(replay_dir))
+        except (OSError, ValueError) as e:
+            print(f"Replay catalog not updated: {e}")
+            return None, None
+        try:
+            return catalog, catalog.add(entry)
+        except (OSError, ValueError) as e:
+            catalog.close()
+            print(f"Replay catalog not updated: {e}")
+            return None, None
     
     def _generate_debug_summary(self):
         """Generate AI-friendly debug annotations"""
-        if not self.events:
-            return {"error": "No events recorded"}
-        
-        # Analyze events for common patterns
-        keystrokes = []
-        word_matches = []
-        failed_matches = []
-        game_states = []
-        level_changes = []
-        
-        for event in self.events:
-            if event["type"] == "keypress":
-                keystrokes.append(event["data"].get("char", ""))
-            elif event["type"] == "word_match":
-                if event["data"]["success"]:
-                    word_matches.append(event["data"]["word"])
-                else:
-                    failed_matches.append(event["data"]["word"])
-            elif event["type"] == "game_state":
-                game_states.append(event["data"])
-            elif event["type"] == "level_change":
-                level_changes.append(event["data"]["level"])
-        
-        # Build keystroke sequence
-        keystroke_sequence = "".join(keystrokes)
-        
-        # Find potential issues
-        issues = []
-        
-        # Look for repeated failed keystrokes
-        if len(keystroke_sequence) > 10:
-            for i in range(len(keystroke_sequence) - 2):
-                substr = keystroke_sequence[i:i+3]
-                if keystroke_sequence.count(substr) > 2:
-                    issues.append(f"Repeated keystroke pattern: '{substr}'")
-        
-        # Look for available words that weren't matched
-        if game_states:
-            last_state = game_states[-1]
-            available_words = []
-            for missile in last_state.get("missiles", []):
-                available_words.append(missile["label"].lower())
-            for powerup in last_state.get("powerups", []):
-                available_words.append(powerup["label"].lower())
-            
-            # Check if typed sequence could form available words
-            typed_seq = last_state.get("typed_sequence", "").lower()
-            if typed_seq and available_words:
-                for word in available_words:
-                    if all(char in typed_seq for char in word):
-                        if word not in [m.lower() for m in word_matches]:
-                            issues.append(f"Available word '{word}' not matched despite having all letters in sequence '{typed_seq}'")
-        
-        return {
-            "session_duration": self.events[-1]["time"] if self.events else 0,
-            "total_keystrokes": len(keystrokes),
-            "keystroke_sequence": keystroke_sequence,
-            "successful_matches": word_matches,
-            "failed_matches": failed_matches,
-            "levels_reached": level_changes,
-            "final_game_state": game_states[-1] if game_states else None,
-            "potential_issues": issues,
-            "common_debugging_hints": {
-                "word_matching": "Check if keystroke sequence contains all letters for available words",
-                "prefix_conflicts": "Look for words with same 2-letter prefix causing conflicts",
-                "sequence_reset": "Check if typed sequence is being reset when it shouldn't be",
-                "timing_issues": "Look for rapid keystrokes that might be processed out of order"
-            }
-        }
+        return self.summary.result()
     
     def stop_recording(self):
         """Stop recording and save"""
         self.recording = False
-        self.save()
+        self.close()
 
 
 class ReplayPlayer:
@@ -207,17 +605,19 @@ class ReplayPlayer:
         self.current_event_index = 0
         self.start_time = None
         self.initial_seed = None
+        self.stream = None                          # events after a seek(), read as playback reaches them
+        self.next_event = None
+        self.state = None                           # complete game state where seek() landed
         
     def load(self):
         """Load replay from file"""
         try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
-                self.events = data["events"]
-                self.initial_seed = data.get("initial_seed")
-                print(f"Loaded replay with {len(self.events)} events")
-                print(f"Initial seed: {self.initial_seed}")
-                return True
+            data = load_replay(self.filename)
+            self.events = data["events"]
+            self.initial_seed = data.get("initial_seed")
+            print(f"Loaded replay with {len(self.events)} events")
+            print(f"Initial seed: {self.initial_seed}")
+            return True
         except Exception as e:
             print(f"Failed to load replay: {e}")
             return False
@@ -230,7 +630,63 @@ class ReplayPlayer:
         # Set the random seed for deterministic behavior
         if self.initial_seed is not None:
             random.seed(self.initial_seed)
+            seed_streams(self.initial_seed)
     
+    def seek(self, seconds=None, level=None, game=0):
+        """Jump to `seconds` into the replay, or to where `level` starts in game `game` (counted from 0)
+
+        Reading starts at the last keyframe before the target, found in the
+        seek index, and goes forward from there, so a seek costs about the
+        same however long the replay is (replays without an index are read
+        from the start). Returns the complete game state at the target, or
+        None if the replay never gets there; get_next_events() then plays
+        on from that point.
+        """
+        if seconds is None and level is None:
+            seconds = 0
+        start = self._find_keyframe(seconds, level, game)
+        current_game = start["game"] if start else 0
+        last_frame = None
+        self.stream = iter_replay_events(self.filename, start["offset"] if start else None)
+        self.next_event = None
+        self.state = None
+        for event in self.stream:
+            data = event["data"]
+            if event["type"] == "game_state":
+                self.state = data
+                frame = data.get("frame")
+                if frame is not None:
+                    if last_frame is not None and frame <= last_frame:
+                        current_game += 1
+                    last_frame = frame
+            if seconds is not None:
+                reached = event["time"] >= seconds
+            else:
+                reached = current_game == game and (
+                    (event["type"] == "game_state" and data.get("level", 0) >= level)
+                    or (event["type"] == "level_change" and data["level"] >= level))
+            if reached:
+                self.next_event = event
+                self.start_time = time.time() - event["time"]
+                return self.state
+        self.stream = None
+        return None
+
+    # the last seek index entry before the target, or None to read from the start
+    def _find_keyframe(self, seconds, level, game):
+        try:
+            index = ReplayIndex(index_filename(self.filename))
+        except (OSError, ValueError):
+            return None
+        try:
+            if seconds is not None:
+                count = index.count_while(lambda entry: entry["time"] <= seconds)
+            else:
+                count = index.count_while(lambda entry: (entry["game"], entry["level"]) < (game, level))
+            return index.entry(count - 1) if count else None
+        finally:
+            index.close()
+
     def get_next_events(self):
         """Get all events that should have occurred by now"""
         if not self.start_time:
@@ -239,6 +695,12 @@ class ReplayPlayer:
         current_time = time.time() - self.start_time
         events = []
         
+        if self.stream is not None:
+            while self.next_event is not None and self.next_event["time"] <= current_time:
+                events.append(self.next_event)
+                self.next_event = next(self.stream, None)
+            return events
+        
         while (self.current_event_index < len(self.events) and 
                self.events[self.current_event_index]["time"] <= current_time):
             events.append(self.events[self.current_event_index])
@@ -248,6 +710,8 @@ class ReplayPlayer:
     
     def is_complete(self):
         """Check if replay is finished"""
+        if self.stream is not None:
+            return self.next_event is None
         return self.current_event_index >= len(self.events)
     
     def get_summary(self):
@@ -281,6 +745,7 @@ def start_recording(filename=None):
     seed = int(time.time() * 1000) % 1000000  # Use microseconds for variety
     replay_recorder.set_initial_seed(seed)
     random.seed(seed)
+    seed_streams(seed)                  # spawn, word, powerup and audio streams
     print(f"Started recording replay: {replay_recorder.filename}")
     print(f"Replay auto-saves every 30 seconds and when game ends")
     print(f"Press F12 to copy current replay path to clipboard for debugging")
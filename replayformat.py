@@ -0,0 +1,816 @@
+import contextlib
+import json
+import os
+import struct
+import zlib
+try:
+    import fcntl
+except ImportError:                                 # Windows
+    fcntl = None
+    import msvcrt
+
+# Binary replay format (.kbr)
+#
+#   file   = MAGIC, version (u16), flags (u16), zlib stream of records
+#   record = tag (u8), payload length (varint), payload
+#
+# Numbers are varints (signed ones zigzag-encoded). Event times are stored
+# as millisecond deltas from the previous event and frames as deltas from
+# the previous frame. Strings (labels, words, typed sequences) are interned:
+# the first use stores the text, later uses store its index. game_state
+# keyframes store every entity; the snapshots between them store only the
+# entities added, moved (relative to their last position) or removed, and
+# the fields that changed. The stream is sync-flushed after
+# every batch, so a file cut short by a crash still decodes up to the last
+# complete batch.
+#
+# Every seek_interval-th keyframe starts a restart point: the
+# stream is fully flushed, a RESTART record is written and the encoder
+# forgets its interned strings, last time/frame and positions. Decoding can
+# begin at a restart point with a fresh decoder and a raw inflater; the
+# seek index (below) lists their byte offsets. Each one costs compression
+# (the zlib dictionary starts empty), hence not every keyframe.
+MAGIC = b"KBRP"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 1
+FILE_HEADER = struct.Struct("<4sHH")
+
+TAG_HEADER = 1
+TAG_SUMMARY = 2
+TAG_GENERIC = 3
+TAG_KEYPRESS = 4
+TAG_WORD_MATCH = 5
+TAG_GAME_STATE = 6
+TAG_SEED = 7
+TAG_SPEED = 8
+TAG_STATE_HASH = 9
+TAG_LEVEL_CHANGE = 10
+TAG_RESTART = 11
+
+SNAPSHOT_KEYFRAME = 1       # game_state flags: complete snapshot with absolute positions
+SNAPSHOT_HAS_FRAME = 2
+SNAPSHOT_HAS_TYPED = 4
+SNAPSHOT_HAS_LEVEL = 8
+SNAPSHOT_HAS_SCORE = 16
+SNAPSHOT_HAS_MISSILES = 32
+SNAPSHOT_HAS_POWERUPS = 64
+SNAPSHOT_FIELDS = ((SNAPSHOT_HAS_FRAME, "frame"), (SNAPSHOT_HAS_TYPED, "typed_sequence"), (SNAPSHOT_HAS_LEVEL, "level"),
+                   (SNAPSHOT_HAS_SCORE, "score"), (SNAPSHOT_HAS_MISSILES, "missiles"), (SNAPSHOT_HAS_POWERUPS, "powerups"))
+POSITION_SCALE = 10         # positions are stored in tenths of a pixel (powerups move 1.5 px a step)
+
+# Seek index (<replay>.idx), appended by the recorder next to a .kbr or .jsonl replay
+#
+#   file  = INDEX_MAGIC, version (u16), entries
+#   entry = byte offset (u64), game (u16), level (u16), frame (u32), time (f64)
+#
+# One fixed-size entry per restart point (every keyframe line of a .jsonl
+# journal), in recording order, so
+# both time and (game, level) only ever grow and lookups are binary searches.
+INDEX_MAGIC = b"KBRI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sH")
+INDEX_ENTRY = struct.Struct("<QHHId")
+
+# Replay catalog (one per replay directory), so listing replays reads one small file
+#
+#   file  = CATALOG_MAGIC, version (u16), entries
+#   entry = file name (128 bytes, UTF-8, zero padded), start time (f64), duration (f64),
+#           size (u64), event count (u32), final score (u32), highest level (u16)
+#
+# Entries are appended when a recording starts, in start order, and each
+# recorder rewrites its own entry in place as it writes the replay. Every
+# read and write holds a lock on the file (flock, or on Windows a byte lock
+# past the end of any entry), so games recording at the same time and
+# view_replay --reindex never interleave. A rebuild rewrites the file in
+# place; a recorder whose entry moved finds it again by name.
+CATALOG_MAGIC = b"KBRC"
+CATALOG_VERSION = 1
+CATALOG_HEADER = struct.Struct("<4sH")
+CATALOG_NAME_SIZE = 128
+CATALOG_ENTRY = struct.Struct(f"<{CATALOG_NAME_SIZE}sddQIIH")
+CATALOG_FIELDS = ("name", "start_time", "duration", "size", "events", "final_score", "max_level")
+CATALOG_LOCK_OFFSET = 0x7FFFFFFF                    # byte locked on Windows (beyond the entries, so reads aren't blocked)
+
+
+def is_keyframe(event):
+    """Is the event a game_state keyframe (a seek index entry)"""
+    return event["type"] == "game_state" and bool(event["data"].get("keyframe"))
+
+
+class KeyframeGames():
+    """Tells which game each keyframe belongs to: frames start again with every new game"""
+    def __init__(self):
+        self.game = 0
+        self.count = 0                              # keyframes so far in this game
+        self.frame = None
+
+    def add(self, event):
+        """Count a keyframe; returns how many came before it in its game"""
+        frame = event["data"].get("frame") or 0
+        if self.frame is not None and frame <= self.frame:
+            self.game += 1
+            self.count = 0
+        self.frame = frame
+        self.count += 1
+        return self.count - 1
+
+
+def index_filename(filename):
+    """The seek index that goes with a replay file"""
+    return filename + ".idx"
+
+
+def is_binary_replay(filename):
+    """Does the file start with the binary replay magic"""
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _zigzag(n):
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n):
+    return n // 2 if n % 2 == 0 else -(n + 1) // 2
+
+
+def _write_varint(out, n):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _to_fixed(value):
+    return int(round(value * POSITION_SCALE))
+
+
+def _from_fixed(q):
+    return q // POSITION_SCALE if q % POSITION_SCALE == 0 else q / POSITION_SCALE
+
+
+class _Unencodable(Exception):
+    """An event doesn't fit its specialised record; it is stored as generic JSON instead"""
+
+
+class ReplayEncoder():
+    """Turns replay events into binary records (one encoder per file, in order)"""
+    def __init__(self, seek_interval = 1):
+        self.seek_interval = seek_interval          # keyframes per restart point
+        self.games = KeyframeGames()
+        self.strings = {}                           # interned text -> index
+        self.new_strings = []                       # interned by the record being built
+        self.last_ms = 0
+        self.last_frame = 0
+        self.positions = {}                         # ("m"|"p", entity id) -> fixed-point (x, y) last recorded
+        self.compressor = zlib.compressobj(6)
+        self.keyframes = []                         # (offset in the last events() output, game, keyframe) per restart point
+
+    def file_header(self):
+        return FILE_HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_ZLIB)
+
+    def header(self, start_time, initial_seed):
+        """Compressed header record: start time and seed"""
+        payload = bytearray(struct.pack("<d", start_time))
+        _write_varint(payload, 0 if initial_seed is None else _zigzag(initial_seed) + 1)
+        return self._compress([(TAG_HEADER, payload)])
+
+    def events(self, events):
+        """Compressed records for a batch of events, with restart points at keyframes"""
+        out = bytearray()
+        records = []
+        self.keyframes = []
+        for event in events:
+            # the first keyframe of each game is a restart point, then every seek_interval-th
+            if is_keyframe(event) and self.games.add(event) % self.seek_interval == 0:
+                out += self._compress(records, zlib.Z_FULL_FLUSH)
+                records = [(TAG_RESTART, b"")]
+                self.strings = {}
+                self.last_ms = 0
+                self.last_frame = 0
+                self.positions = {}
+                self.keyframes.append((len(out), self.games.game, event))
+            records.append(self._event(event))
+        out += self._compress(records)
+        return bytes(out)
+
+    def summary(self, summary):
+        """Compressed trailer record holding the debug summary"""
+        return self._compress([(TAG_SUMMARY, json.dumps(summary).encode())])
+
+    def _compress(self, records, flush = zlib.Z_SYNC_FLUSH):
+        out = bytearray()
+        for tag, payload in records:
+            out.append(tag)
+            _write_varint(out, len(payload))
+            out += payload
+        return self.compressor.compress(bytes(out)) + self.compressor.flush(flush)
+
+    def _event(self, event):
+        encode = self._ENCODERS.get(event["type"])
+        self.new_strings = []
+        if encode is not None:
+            saved = (self.last_ms, self.last_frame, self.positions)
+            try:
+                payload = bytearray()
+                self._time(payload, event["time"])
+                encode(self, payload, event["data"])
+                return encode.tag, payload
+            except (_Unencodable, KeyError, TypeError, ValueError, AttributeError):
+                # undo what the failed attempt changed, then store it generically
+                for text in self.new_strings:
+                    del self.strings[text]
+                self.new_strings = []
+                self.last_ms, self.last_frame, self.positions = saved
+        payload = bytearray()
+        self._time(payload, event["time"])
+        self._string(payload, event["type"])
+        data = json.dumps(event["data"]).encode()
+        _write_varint(payload, len(data))
+        payload += data
+        return TAG_GENERIC, payload
+
+    def _time(self, out, seconds):
+        ms = int(round(seconds * 1000))
+        _write_varint(out, _zigzag(ms - self.last_ms))
+        self.last_ms = ms
+
+    def _frame(self, out, frame):
+        if not isinstance(frame, int):
+            raise _Unencodable()
+        _write_varint(out, _zigzag(frame - self.last_frame))
+        self.last_frame = frame
+
+    def _string(self, out, text):
+        if not isinstance(text, str):
+            raise _Unencodable()
+        index = self.strings.get(text)
+        if index is not None:
+            _write_varint(out, index + 1)
+            return
+        self.strings[text] = len(self.strings)
+        self.new_strings.append(text)
+        raw = text.encode()
+        _write_varint(out, 0)
+        _write_varint(out, len(raw))
+        out += raw
+
+    def _uint(self, out, n):
+        if not isinstance(n, int) or n < 0:
+            raise _Unencodable()
+        _write_varint(out, n)
+
+    def _keypress(self, out, data):
+        if data.get("unicode", data["char"]) != data["char"]:
+            raise _Unencodable()
+        frame = data.get("frame")
+        out.append(0 if frame is None else 1)
+        self._string(out, data["char"])
+        self._uint(out, data["key"])
+        if frame is not None:
+            self._frame(out, frame)
+    _keypress.tag = TAG_KEYPRESS
+
+    def _word_match(self, out, data):
+        self._string(out, data["word"])
+        self._string(out, data["type"])
+        out.append(1 if data["success"] else 0)
+    _word_match.tag = TAG_WORD_MATCH
+
+    def _game_state(self, out, data):
+        # keyframe: every entity with an absolute position; otherwise added / moved / removed
+        # entities, moved ones relative to their last recorded position
+        if set(data) - {"frame", "keyframe", "typed_sequence", "level", "score", "missiles", "powerups"}:
+            raise _Unencodable()
+        keyframe = bool(data.get("keyframe"))
+        flags = SNAPSHOT_KEYFRAME if keyframe else 0
+        for bit, name in SNAPSHOT_FIELDS:
+            if name in data:
+                flags |= bit
+        out.append(flags)
+        if "frame" in data:
+            self._frame(out, data["frame"])
+        if "typed_sequence" in data:
+            self._string(out, data["typed_sequence"])
+        if "level" in data:
+            self._uint(out, data["level"])
+        if "score" in data:
+            _write_varint(out, _zigzag(data["score"]))
+        positions = {} if keyframe else dict(self.positions)
+        for kind, key in (("m", "missiles"), ("p", "powerups")):
+            if key not in data:
+                continue
+            change = data[key]
+            if keyframe:
+                if not isinstance(change, list):
+                    raise _Unencodable()
+                added, moved, removed = change, [], []
+            else:
+                if not isinstance(change, dict) or set(change) - {"added", "moved", "removed"}:
+                    raise _Unencodable()
+                added, moved, removed = change.get("added", []), change.get("moved", []), change.get("removed", [])
+            _write_varint(out, len(added))
+            for entry in added:
+                x, y = _to_fixed(entry["pos"][0]), _to_fixed(entry["pos"][1])
+                self._uint(out, entry["id"])
+                self._string(out, entry["label"])
+                _write_varint(out, _zigzag(x))
+                _write_varint(out, _zigzag(y))
+                positions[(kind, entry["id"])] = (x, y)
+            if keyframe:
+                continue
+            _write_varint(out, len(moved))
+            for entry in moved:
+                x, y = _to_fixed(entry["pos"][0]), _to_fixed(entry["pos"][1])
+                last = positions[(kind, entry["id"])]
+                self._uint(out, entry["id"])
+                _write_varint(out, _zigzag(x - last[0]))
+                _write_varint(out, _zigzag(y - last[1]))
+                positions[(kind, entry["id"])] = (x, y)
+            _write_varint(out, len(removed))
+            for i in removed:
+                self._uint(out, i)
+                positions.pop((kind, i), None)
+        self.positions = positions
+    _game_state.tag = TAG_GAME_STATE
+
+    def _seed(self, out, data):
+        if not isinstance(data["value"], int):
+            raise _Unencodable()
+        _write_varint(out, _zigzag(data["value"]))
+    _seed.tag = TAG_SEED
+
+    def _speed(self, out, data):
+        self._frame(out, data["frame"])
+        self._uint(out, _to_fixed(data["speed"]))
+    _speed.tag = TAG_SPEED
+
+    def _state_hash(self, out, data):
+        self._frame(out, data["frame"])
+        self._uint(out, data["hash"])
+    _state_hash.tag = TAG_STATE_HASH
+
+    def _level_change(self, out, data):
+        self._uint(out, data["level"])
+    _level_change.tag = TAG_LEVEL_CHANGE
+
+    _ENCODERS = {
+        "keypress": _keypress,
+        "word_match": _word_match,
+        "game_state": _game_state,
+        "seed": _seed,
+        "speed": _speed,
+        "state_hash": _state_hash,
+        "level_change": _level_change,
+    }
+
+
+class JournalEncoder():
+    """Same interface as ReplayEncoder for the JSON-lines journal (.jsonl), one object per line"""
+    def __init__(self):
+        self.games = KeyframeGames()
+        self.keyframes = []                         # (offset in the last events() output, game, keyframe) per keyframe line
+
+    def file_header(self):
+        return b""
+
+    def header(self, start_time, initial_seed):
+        return self._lines([{"type": "header", "version": "2.0", "start_time": start_time, "initial_seed": initial_seed}])
+
+    def events(self, events):
+        out = bytearray()
+        self.keyframes = []
+        for event in events:
+            if is_keyframe(event):
+                self.games.add(event)
+                self.keyframes.append((len(out), self.games.game, event))
+            out += self._lines([event])
+        return bytes(out)
+
+    def summary(self, summary):
+        return self._lines([{"type": "summary", "data": summary}])
+
+    def _lines(self, entries):
+        return "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+
+
+def iter_journal(f):
+    """Yield ("header"|"summary"|"event", value) from an open (binary mode) JSON-lines journal"""
+    for line in f:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue                                # partly written line from a crash
+        if entry.get("type") == "header":
+            yield "header", entry
+        elif entry.get("type") == "summary":
+            yield "summary", entry["data"]
+        else:
+            yield "event", entry
+
+
+def new_encoder(filename, seek_interval = 1):
+    """The encoder for a replay file: JSON lines for .jsonl, binary otherwise"""
+    return JournalEncoder() if filename.endswith('.jsonl') else ReplayEncoder(seek_interval)
+
+
+def iter_replay_file(filename, offset = None):
+    """Yield ("header"|"summary"|"event", value) from a binary replay or a JSON-lines journal
+
+    With an offset from the seek index, reading starts at that keyframe.
+    """
+    binary = is_binary_replay(filename)
+    with open(filename, 'rb') as f:
+        if binary:
+            yield from iter_binary_replay(f, offset = offset)
+        else:
+            if offset:
+                f.seek(offset)
+            yield from iter_journal(f)
+
+
+class ReplayIndex():
+    """A replay's seek index, read one entry at a time (entries are fixed size)
+
+    Entries are dicts with offset, game, level, frame and time. Lookups
+    are binary searches, so they cost the same however long the replay is.
+    """
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        header = self.file.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size or INDEX_HEADER.unpack(header)[0] != INDEX_MAGIC:
+            self.file.close()
+            raise ValueError("not a replay seek index")
+        if INDEX_HEADER.unpack(header)[1] > INDEX_VERSION:
+            self.file.close()
+            raise ValueError("replay seek index is newer than this game")
+        self.file.seek(0, 2)
+        self.count = (self.file.tell() - INDEX_HEADER.size) // INDEX_ENTRY.size   # a torn last entry is ignored
+
+    def __len__(self):
+        return self.count
+
+    def entry(self, i):
+        self.file.seek(INDEX_HEADER.size + i * INDEX_ENTRY.size)
+        offset, game, level, frame, time = INDEX_ENTRY.unpack(self.file.read(INDEX_ENTRY.size))
+        return {"offset": offset, "game": game, "level": level, "frame": frame, "time": time}
+
+    def count_while(self, predicate):
+        """How many leading entries the predicate holds for (it must hold for a prefix of the entries)"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if predicate(self.entry(middle)):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self):
+        self.file.close()
+
+
+class ReplayCatalog():
+    """A replay directory's catalog file: one fixed-size entry per replay
+
+    Entries are dicts with CATALOG_FIELDS. add() appends one (once per
+    file name) and returns its slot; update() rewrites a slot in place;
+    rewrite() replaces them all.
+    """
+    def __init__(self, filename, check = True):
+        # opened without truncating: another game may have just created it
+        # check: refuse a file that isn't a catalog (False when about to rewrite() it)
+        self.file = os.fdopen(os.open(filename, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)), 'r+b')
+        try:
+            with self.locked():
+                self.file.seek(0)
+                header = self.file.read(CATALOG_HEADER.size)
+                if not header:
+                    header = CATALOG_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION)
+                    self.file.write(header)
+                    self.file.flush()
+        except OSError:
+            self.file.close()
+            raise
+        if not check:
+            return
+        if len(header) < CATALOG_HEADER.size or CATALOG_HEADER.unpack(header)[0] != CATALOG_MAGIC:
+            self.file.close()
+            raise ValueError("not a replay catalog")
+        if CATALOG_HEADER.unpack(header)[1] > CATALOG_VERSION:
+            self.file.close()
+            raise ValueError("replay catalog is newer than this game")
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Hold the catalog's lock; other games and --reindex wait for it"""
+        if fcntl:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        else:
+            self.file.seek(CATALOG_LOCK_OFFSET)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)     # retries for 10 seconds, then OSError
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(CATALOG_LOCK_OFFSET)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def __len__(self):
+        self.file.seek(0, 2)
+        return (self.file.tell() - CATALOG_HEADER.size) // CATALOG_ENTRY.size   # a torn last entry is ignored
+
+    def entry(self, slot):
+        with self.locked():
+            self.file.seek(CATALOG_HEADER.size + slot * CATALOG_ENTRY.size)
+            return self._unpack(self.file.read(CATALOG_ENTRY.size))
+
+    def entries(self):
+        """Every entry, oldest recording first (one read)"""
+        with self.locked():
+            count = len(self)
+            self.file.seek(CATALOG_HEADER.size)
+            data = self.file.read(count * CATALOG_ENTRY.size)
+        return [self._unpack(data[i:i + CATALOG_ENTRY.size]) for i in range(0, len(data), CATALOG_ENTRY.size)]
+
+    def add(self, entry):
+        """Append an entry, or rewrite the one already listed under its name; returns its slot"""
+        data = self._pack(entry)
+        with self.locked():
+            slot = self._find(data[:CATALOG_NAME_SIZE], len(self))
+            self._write(slot, data)
+        return slot
+
+    def update(self, slot, entry):
+        """Rewrite an entry; returns its slot, which differs from the one given if a rebuild moved it"""
+        data = self._pack(entry)
+        with self.locked():
+            count = len(self)
+            if slot >= count or self._name(slot) != data[:CATALOG_NAME_SIZE]:
+                slot = self._find(data[:CATALOG_NAME_SIZE], count)
+            self._write(slot, data)
+        return slot
+
+    def rewrite(self, entries):
+        """Replace every entry, in place (recorders holding the file keep using it)"""
+        data = b"".join(self._pack(entry) for entry in entries)
+        with self.locked():
+            self.file.seek(0)
+            self.file.write(CATALOG_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION) + data)
+            self.file.truncate()
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def _pack(self, entry):
+        name = entry["name"].encode()
+        if len(name) > CATALOG_NAME_SIZE:
+            raise ValueError(f"replay file name too long for the catalog: {entry['name']}")
+        return CATALOG_ENTRY.pack(name, entry["start_time"], entry["duration"], entry["size"],
+                                  min(entry["events"], 0xFFFFFFFF), min(max(entry["final_score"], 0), 0xFFFFFFFF),
+                                  min(entry["max_level"], 0xFFFF))
+
+    # lock held by the caller from here down
+    def _write(self, slot, data):
+        self.file.seek(CATALOG_HEADER.size + slot * CATALOG_ENTRY.size)
+        self.file.write(data)
+        self.file.flush()
+
+    def _name(self, slot):
+        self.file.seek(CATALOG_HEADER.size + slot * CATALOG_ENTRY.size)
+        return self.file.read(CATALOG_NAME_SIZE)
+
+    # slot of the entry with a packed name, or the next free slot
+    def _find(self, name, count):
+        self.file.seek(CATALOG_HEADER.size)
+        data = self.file.read(count * CATALOG_ENTRY.size)
+        for slot in range(count):
+            if data[slot * CATALOG_ENTRY.size:slot * CATALOG_ENTRY.size + CATALOG_NAME_SIZE] == name:
+                return slot
+        return count
+
+    def _unpack(self, data):
+        entry = dict(zip(CATALOG_FIELDS, CATALOG_ENTRY.unpack(data)))
+        entry["name"] = entry["name"].rstrip(b"\0").decode(errors='replace')
+        return entry
+
+
+def index_entry(offset, game, event):
+    """Packed seek index entry for a keyframe event written at the given byte offset"""
+    data = event["data"]
+    return INDEX_ENTRY.pack(offset, game, data.get("level") or 0, data.get("frame") or 0, event["time"])
+
+
+class _Reader():
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def byte(self):
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self):
+        shift = 0
+        value = 0
+        while True:
+            b = self.data[self.pos]
+            self.pos += 1
+            value |= (b & 0x7f) << shift
+            if b < 0x80:
+                return value
+            shift += 7
+
+    def signed(self):
+        return _unzigzag(self.varint())
+
+    def raw(self, n):
+        value = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return bytes(value)
+
+
+class ReplayDecoder():
+    """Turns binary records back into replay entries, mirroring ReplayEncoder"""
+    def __init__(self):
+        self.strings = []
+        self.last_ms = 0
+        self.last_frame = 0
+        self.positions = {}                         # as in ReplayEncoder
+
+    def record(self, tag, payload):
+        """Decode one record: ("header", dict), ("summary", dict), ("event", event) or None (restart point)"""
+        r = _Reader(payload)
+        if tag == TAG_HEADER:
+            start_time = struct.unpack("<d", r.raw(8))[0]
+            seed = r.varint()
+            return "header", {"start_time": start_time, "initial_seed": None if seed == 0 else _unzigzag(seed - 1)}
+        if tag == TAG_SUMMARY:
+            return "summary", json.loads(payload.decode())
+        if tag == TAG_RESTART:
+            # the encoder started afresh here
+            self.strings = []
+            self.last_ms = 0
+            self.last_frame = 0
+            self.positions = {}
+            return None
+        self.last_ms += r.signed()
+        time = self.last_ms / 1000.0
+        if tag == TAG_GENERIC:
+            event_type = self._string(r)
+            data = json.loads(r.raw(r.varint()).decode())
+        else:
+            event_type, data = self._DECODERS[tag](self, r)
+        return "event", {"time": time, "type": event_type, "data": data}
+
+    def _string(self, r):
+        index = r.varint()
+        if index:
+            return self.strings[index - 1]
+        text = r.raw(r.varint()).decode()
+        self.strings.append(text)
+        return text
+
+    def _frame(self, r):
+        self.last_frame += r.signed()
+        return self.last_frame
+
+    def _keypress(self, r):
+        has_frame = r.byte()
+        char = self._string(r)
+        key = r.varint()
+        frame = self._frame(r) if has_frame else None
+        return "keypress", {"char": char, "key": key, "unicode": char, "frame": frame}
+
+    def _word_match(self, r):
+        word = self._string(r)
+        target_type = self._string(r)
+        return "word_match", {"word": word, "type": target_type, "success": bool(r.byte())}
+
+    def _game_state(self, r):
+        flags = r.byte()
+        data = {}
+        if flags & SNAPSHOT_HAS_FRAME:
+            data["frame"] = self._frame(r)
+        if flags & SNAPSHOT_KEYFRAME:
+            data["keyframe"] = True
+        if flags & SNAPSHOT_HAS_TYPED:
+            data["typed_sequence"] = self._string(r)
+        if flags & SNAPSHOT_HAS_LEVEL:
+            data["level"] = r.varint()
+        if flags & SNAPSHOT_HAS_SCORE:
+            data["score"] = r.signed()
+        keyframe = flags & SNAPSHOT_KEYFRAME
+        positions = {} if keyframe else self.positions
+        for kind, key, bit in (("m", "missiles", SNAPSHOT_HAS_MISSILES), ("p", "powerups", SNAPSHOT_HAS_POWERUPS)):
+            if not flags & bit:
+                continue
+            added = []
+            for i in range(r.varint()):
+                entity = r.varint()
+                label = self._string(r)
+                x, y = r.signed(), r.signed()
+                positions[(kind, entity)] = (x, y)
+                added.append({"id": entity, "label": label, "pos": [_from_fixed(x), _from_fixed(y)]})
+            if keyframe:
+                data[key] = added
+                continue
+            moved = []
+            for i in range(r.varint()):
+                entity = r.varint()
+                last = positions[(kind, entity)]
+                x, y = last[0] + r.signed(), last[1] + r.signed()
+                positions[(kind, entity)] = (x, y)
+                moved.append({"id": entity, "pos": [_from_fixed(x), _from_fixed(y)]})
+            removed = []
+            for i in range(r.varint()):
+                entity = r.varint()
+                positions.pop((kind, entity), None)
+                removed.append(entity)
+            change = {}
+            if added:
+                change["added"] = added
+            if moved:
+                change["moved"] = moved
+            if removed:
+                change["removed"] = removed
+            data[key] = change
+        self.positions = positions
+        return "game_state", data
+
+    def _seed(self, r):
+        return "seed", {"value": r.signed()}
+
+    def _speed(self, r):
+        frame = self._frame(r)
+        return "speed", {"frame": frame, "speed": _from_fixed(r.varint())}
+
+    def _state_hash(self, r):
+        frame = self._frame(r)
+        return "state_hash", {"frame": frame, "hash": r.varint()}
+
+    def _level_change(self, r):
+        return "level_change", {"level": r.varint()}
+
+    _DECODERS = {
+        TAG_KEYPRESS: _keypress,
+        TAG_WORD_MATCH: _word_match,
+        TAG_GAME_STATE: _game_state,
+        TAG_SEED: _seed,
+        TAG_SPEED: _speed,
+        TAG_STATE_HASH: _state_hash,
+        TAG_LEVEL_CHANGE: _level_change,
+    }
+
+
+def iter_binary_replay(f, chunk_size = 1 << 16, offset = None):
+    """Yield ("header"|"summary"|"event", value) from an open binary replay file
+
+    Reads and decompresses in chunks, so memory stays bounded; a record cut
+    off at the end of the file (crash while writing) is dropped. With an
+    offset (a restart point from the seek index) reading starts there.
+    """
+    magic, version, flags = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("not a binary replay")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"replay format version {version} is newer than this game ({FORMAT_VERSION})")
+    if offset:
+        f.seek(offset)
+    # a restart point is mid-stream: raw deflate, without the zlib header at the start of the file
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS if offset else zlib.MAX_WBITS) if flags & FLAG_ZLIB else None
+    decoder = ReplayDecoder()
+    buffer = bytearray()
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        try:
+            buffer += decompressor.decompress(chunk) if decompressor else chunk
+        except zlib.error:
+            break                                   # damaged tail: keep what decoded so far
+        pos = 0
+        while True:
+            # tag, length varint, payload; stop when the buffer holds only part of a record
+            r = _Reader(buffer)
+            r.pos = pos
+            try:
+                tag = r.byte()
+                length = r.varint()
+            except IndexError:
+                break
+            if r.pos + length > len(buffer):
+                break
+            payload = buffer[r.pos:r.pos + length]
+            pos = r.pos + length
+            try:
+                entry = decoder.record(tag, payload)
+            except (IndexError, KeyError) as e:
+                raise ValueError(f"damaged replay record (tag {tag})") from e
+            if entry is not None:
+                yield entry
+        del buffer[:pos]
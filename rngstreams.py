@@ -0,0 +1,23 @@
+import random
+
+# One random stream per subsystem, so what one subsystem draws never shifts
+# another's sequence: audio being on or off, or rendering being skipped,
+# leaves spawning and word choice exactly as recorded.
+spawn_rng = random.Random()                         # missile origins and targets
+word_rng = random.Random()                          # missile labels and words
+powerup_rng = random.Random()                       # powerup spawn timing, side, height and word
+audio_rng = random.Random()                         # sound-bag shuffles and picks
+
+_STREAMS = {
+    "spawn": spawn_rng,
+    "words": word_rng,
+    "powerups": powerup_rng,
+    "audio": audio_rng,
+}
+
+
+def seed_streams(seed):
+    """Re-seed every stream from one game seed (the replay's initial seed)"""
+    # string seeds are hashed with SHA-512, so each stream is the same in every process
+    for name, rng in _STREAMS.items():
+        rng.seed(f"{seed}:{name}")
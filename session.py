@@ -0,0 +1,377 @@
+import zlib
+from config import *
+from city import City
+from defense import Defense
+from mcgame import McGame
+from missile import missile_pool
+from explosion import explosion_pool
+from powerup import powerup_pool
+from highlight import HighlightState
+from matcher import WordMatcher, StrictMatcher
+from wordpool import PrefixSet
+from missilefield import new_missile_field
+from gameclock import GameClock, TIME_EPSILON
+from rngstreams import powerup_rng
+
+# Typing behavior
+ALLOWED_TYPING_KEYS = set(list("qwertyuiop") + list("asdfghjkl;") + list("zxcvbnm"))  # labels include 'p'
+RESERVED_TYPING_KEYS = set()  # no reserved typing keys; only ESC pauses
+
+
+def get_word_prefix(word):
+    """Get the first 2 characters of a word for conflict checking"""
+    if not word or len(word) < 2:
+        return word.lower() if word else ""
+    return word[:2].lower()
+
+
+class GameSession():
+    """One game of KeyBlaster, independent of the display, audio and clock.
+
+    step() advances the game by one fixed timestep (one frame at FPS) and
+    type_key() feeds a typed character, so a driver can run it in real time
+    behind a window or as fast as possible with no display at all. Sounds
+    are reported by name through the sound callback; draw() renders the
+    current state onto a pygame surface when there is one.
+    """
+    def __init__(self, high_score = 0, sound = None, recorder = None):
+        self.sound = sound or (lambda name: None)   # callback: sound name -> None
+        self.recorder = recorder                    # optional ReplayRecorder for word matches
+        self.high_score = high_score
+        self.missile_list = []                      # list of all active missiles
+        self.explosion_list = []                    # list of all active explosions
+        self.powerup_list = []
+        self.missile_field = new_missile_field()    # vectorized missile motion (None without NumPy)
+        self.reset()
+
+    def reset(self, high_score = None):
+        """Start a new game; entities still in play go back to their pools"""
+        if high_score is not None:
+            self.high_score = high_score
+        if self.missile_field:
+            self.missile_field.clear()
+        missile_pool.release_all(self.missile_list)
+        explosion_pool.release_all(self.explosion_list)
+        powerup_pool.release_all(self.powerup_list)
+
+        self.city_list = []
+        for i in range(1, 8):   # 8 == Max num cities plus defense plus one
+            if i == 8 // 2:     # find centre point for gun
+                pass
+            else:
+                self.city_list.append(City(i, 7))   # 7 == max num cities plus guns
+        self.defense = Defense()                    # Intercepter gun
+        self.mcgame = McGame(1, self.high_score)
+
+        self.state = GAME_STATE_RUNNING
+        self.frame = 0                              # fixed timesteps since the game started
+        self.clock = GameClock()                    # game and real time for every timer
+        self.recorded_speed = self.clock.speed      # last speed written to the replay
+        self.state_hash = 0                         # rolling hash of the state every STATE_HASH_INTERVAL steps
+
+        # Typing state
+        self.typed_sequence = ""                    # Current sequence of typed characters
+        self.active_word_prefixes = PrefixSet()     # prefixes (first 2 characters) of on-screen words
+        self.highlight = HighlightState()           # typed-prefix highlighting for on-screen labels
+        # strict mode only accepts contiguous, in-order typing
+        self.word_matcher = StrictMatcher() if STRICT_TYPING else WordMatcher()
+
+        # Delayed destruction system for turret animation
+        self.pending_destruction = None             # (type, target, serial) waiting for destruction
+        self.destruction_timer = 0                  # Timer for destruction delay
+        self.destruction_queue = []                 # Queue of (type, target, serial) waiting for destruction
+
+        self.turbo_timer = 0                        # Seconds of temporary turbo left (real time)
+
+    # --- typing systems
+
+    def track_target(self, target_type, target):
+        """Register a newly spawned missile/powerup word with the typing systems"""
+        prefix = get_word_prefix(target.label)
+        if prefix:
+            self.active_word_prefixes.add(prefix)
+        self.highlight.add_target(target)
+        self.word_matcher.add(target_type, target)
+        target.prefix_tracked = True
+
+    def untrack_target(self, target):
+        """Remove a missile/powerup word from the typing systems"""
+        self.active_word_prefixes.discard(get_word_prefix(target.label))
+        self.highlight.remove_target(target)
+        self.word_matcher.remove(target)
+
+    def reset_typed_sequence(self):
+        """Clear the typed sequence and the matcher's typed letters"""
+        self.typed_sequence = ""
+        self.word_matcher.reset()
+
+    def type_key(self, ch):
+        """Feed one typed character (already lowercased)"""
+        # react to printable single characters that aren't reserved hotkeys
+        printable_key = len(ch) == 1 and ch.isprintable() and ch not in RESERVED_TYPING_KEYS
+
+        if printable_key and ch in ALLOWED_TYPING_KEYS:
+            # Add character to typed sequence
+            self.typed_sequence += ch
+
+            # Check for complete word matches (any letter order unless STRICT_TYPING)
+            completed_targets = []
+            for target_type, target_obj, word in self.word_matcher.feed(ch):
+                completed_targets.append((target_type, target_obj))
+                # Claimed targets stop matching so they can't be queued twice
+                self.word_matcher.remove(target_obj)
+                # Record successful word match
+                if self.recorder:
+                    self.recorder.record_word_match(word, target_type, True)
+
+            # Process completed words
+            if completed_targets:
+                for target_type, target_obj in completed_targets:
+                    if self.pending_destruction is None:
+                        # Start destruction immediately
+                        self.defense.aim_at_target(target_obj)
+                        self.pending_destruction = (target_type, target_obj, target_obj.serial)
+                        self.destruction_timer = 0
+                    else:
+                        # Queue for later destruction
+                        self.destruction_queue.append((target_type, target_obj, target_obj.serial))
+
+                # Clear the typed sequence since we found and processed matches
+                # In a queue system, once words are matched, we start fresh
+                self.reset_typed_sequence()
+            elif not self.word_matcher.has_potential_match(self.typed_sequence):
+                # No potential matches - if the key is on no label at all, activate temporary turbo mode
+                if not self.word_matcher.has_char(ch):
+                    self.turbo_timer = TURBO_DURATION
+
+                # Reset sequence and play miss sound
+                self.reset_typed_sequence()
+                self.sound('miss')
+            # otherwise the sequence can still complete a word, so keep building it
+        elif printable_key:
+            # Invalid key - reset sequence
+            self.reset_typed_sequence()
+            self.sound('miss')
+
+        # refresh typed-prefix highlighting (no-op unless the sequence changed)
+        self.highlight.set_sequence(self.typed_sequence)
+
+    @property
+    def turbo_active(self):
+        """Temporary turbo after a key that is on no label"""
+        return self.turbo_timer > TIME_EPSILON
+
+    # --- simulation
+
+    def step(self):
+        """Advance one fixed timestep; returns the game state (running, new level or over)"""
+        if self.state != GAME_STATE_RUNNING:
+            return self.state
+        clock = self.clock
+        if self.recorder and clock.speed != self.recorded_speed:
+            # turbo changes how real-time timers run, so playback needs it per step
+            self.recorder.record_speed(self.frame, clock.speed)
+            self.recorded_speed = clock.speed
+        self.frame += 1
+        clock.tick()
+
+        # --- interceptor turret
+        self.defense.update(clock.sim_dt)
+
+        # --- missiles
+        if self.missile_field:
+            # missiles are attached when they spawn: move them all in one vectorized step,
+            # then detonate arrivals in list (attach) order
+            arrived = self.missile_field.step()
+            for missile in arrived:
+                missile.explode(self.explosion_list, self.sound)
+            if arrived:
+                for missile in arrived:
+                    self._remove_missile(missile)
+                self.missile_list[:] = [missile for missile in self.missile_list if not missile.detonated]
+        else:
+            for missile in self.missile_list[:]:
+                missile.update(self.explosion_list, self.sound)
+                if missile.detonated:
+                    self._remove_missile(missile)
+                    self.missile_list.remove(missile)
+
+        # --- powerups
+        for powerup in self.powerup_list[:]:
+            if not powerup.update():
+                # Remove word prefix from tracking
+                if powerup.label:
+                    self.untrack_target(powerup)
+                self.powerup_list.remove(powerup)
+                powerup_pool.release(powerup)
+
+        # --- explosions
+        for explosion in self.explosion_list[:]:
+            explosion.update()
+            if explosion.complete:
+                self.explosion_list.remove(explosion)
+                explosion_pool.release(explosion)
+
+        # --- update game mcgame
+        mcgame = self.mcgame
+        # Update powerup system
+        mcgame.update_powerup_system(self.defense, clock.sim_dt, clock.real_dt)
+
+        # Spawn powerup occasionally
+        if mcgame.should_spawn_powerup():
+            side = powerup_rng.choice(["left", "right"])
+            self.powerup_list.append(powerup_pool.acquire(side, self.active_word_prefixes))
+
+        removed_missiles = []
+        destroyed_cities = []
+        spawned_missiles = []
+        self.state = mcgame.update(self.missile_list, self.explosion_list, self.city_list,
+                                   removed_missiles, destroyed_cities, self.active_word_prefixes, spawned_missiles)
+        if self.missile_field:
+            for missile in spawned_missiles:
+                self.missile_field.attach(missile)
+        for city in destroyed_cities:
+            self.sound('citydown')
+
+        # Stop tracking words of missiles caught in explosions
+        for missile in removed_missiles:
+            self._remove_missile(missile)
+
+        # Track word prefixes for newly created missiles and powerups
+        for missile in self.missile_list:
+            if missile.label and not missile.prefix_tracked:
+                self.track_target('missile', missile)
+        for powerup in self.powerup_list:
+            if powerup.label and not powerup.prefix_tracked:
+                self.track_target('powerup', powerup)
+
+        # Handle delayed destruction after turret aiming
+        if self.pending_destruction is not None:
+            self.destruction_timer += 1
+            if self.defense.is_aiming_complete():
+                self._destroy_pending()
+
+        # Update temporary turbo mode timer
+        if self.turbo_timer > 0:
+            self.turbo_timer = max(0, self.turbo_timer - clock.real_dt)
+
+        self.highlight.set_sequence(self.typed_sequence)
+
+        if self.recorder and self.frame % SNAPSHOT_INTERVAL == 0:
+            self.recorder.record_game_state(self.missile_list, self.powerup_list, self.typed_sequence,
+                                            self.get_level(), self.get_score(), self.frame)
+        if self.frame % STATE_HASH_INTERVAL == 0:
+            self.state_hash = self.hash_state()
+            if self.recorder:
+                self.recorder.record_state_hash(self.frame, self.state_hash)
+        return self.state
+
+    def hash_state(self):
+        """Fold the current state (missiles, powerups, score, level, cities) into the rolling hash
+
+        Each hash includes the previous one, so once two runs diverge every
+        later hash differs too.
+        """
+        state = (
+            [(tuple(m.pos), m.label) for m in self.missile_list],
+            [(tuple(p.pos), p.label) for p in self.powerup_list],
+            self.get_score(),
+            self.get_level(),
+            [city.destroyed for city in self.city_list],
+        )
+        return zlib.crc32(repr(state).encode(), self.state_hash)
+
+    def start_next_level(self, screen = None):
+        """Reset typing and queued destructions and begin the next level"""
+        # Reset typing state and turbo mode when starting new level
+        self.reset_typed_sequence()  # Clear any partial typing
+        self.turbo_timer = 0
+
+        # Clear any pending/queued destructions that might be hanging around
+        self.pending_destruction = None
+        self.destruction_timer = 0
+        self.destruction_queue.clear()
+        # Clean up and re-track all existing powerup words for the new level
+        self.active_word_prefixes.clear()
+        self.highlight.clear()
+        self.word_matcher.clear()
+        for powerup in self.powerup_list:
+            if powerup.label:
+                self.track_target('powerup', powerup)
+        self.mcgame.new_level(screen, self.defense)
+        self.state = GAME_STATE_RUNNING
+
+    # a missile left play: stop tracking its word and return it to the pool
+    def _remove_missile(self, missile):
+        if missile.label:
+            self.untrack_target(missile)
+        if self.missile_field:
+            self.missile_field.release(missile)
+        missile_pool.release(missile)
+
+    # the turret has finished aiming at the pending target: destroy it and aim at the next
+    def _destroy_pending(self):
+        target_type, target_obj, serial = self.pending_destruction
+        if target_obj.serial != serial:
+            pass    # target left play (and may have been reused) while queued
+        elif target_type == 'missile':
+            # Fire laser beam and destroy missile
+            lead_pos = target_obj.get_future_pos(pixels_ahead=20)
+            self.defense.fire_laser(lead_pos)
+            self.explosion_list.append(explosion_pool.acquire(lead_pos, 1, INTERCEPT_RADIUS, INTERCEPT_EXPLOSION))
+            # Remove word prefix from tracking before clearing label
+            if target_obj.label:
+                self.untrack_target(target_obj)
+            target_obj.label = None
+            self.sound('explode')
+        elif target_type == 'powerup':
+            # Fire laser beam and destroy powerup
+            powerup_pos = target_obj.get_pos()
+            self.defense.fire_laser(powerup_pos)
+
+            # Add explosion effect for powerup destruction
+            self.explosion_list.append(explosion_pool.acquire(powerup_pos, 1, INTERCEPT_RADIUS, INTERCEPT_EXPLOSION))
+
+            self.mcgame.activate_powerup(self.defense)
+            self.mcgame.add_score(target_obj.destroy())
+            # Remove word prefix from tracking
+            if target_obj.label:
+                self.untrack_target(target_obj)
+            self.powerup_list.remove(target_obj)
+            powerup_pool.release(target_obj)
+            self.sound('powerup')
+
+        # Reset destruction system and process queue
+        self.pending_destruction = None
+        self.destruction_timer = 0
+        self.defense.stop_aiming()
+
+        # Process next item in queue if any (skipping targets that already left play)
+        while self.destruction_queue:
+            next_target_type, next_target_obj, next_serial = self.destruction_queue.pop(0)
+            if next_target_obj.serial != next_serial:
+                continue
+            self.defense.aim_at_target(next_target_obj)
+            self.pending_destruction = (next_target_type, next_target_obj, next_serial)
+            break
+
+    # --- rendering
+
+    def draw(self, screen):
+        """Draw the current state (cities, turret, missiles, powerups, explosions, HUD)"""
+        for city in self.city_list:
+            city.draw(screen)
+        self.defense.draw(screen)
+        for missile in self.missile_list:
+            missile.draw(screen)
+        for powerup in self.powerup_list:
+            powerup.draw(screen)
+        for explosion in self.explosion_list:
+            explosion.draw(screen)
+        self.mcgame.draw(screen, self.defense)
+
+    def get_score(self):
+        return self.mcgame.get_player_score()
+
+    def get_level(self):
+        return self.mcgame.difficulty
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Batch Game Simulator for KeyBlaster
+
+Plays many headless games in parallel with a simulated typist and reports
+the level reached, survival per level and score distributions, for tuning
+missile speed, level increments and word tiers without playing by hand.
+Every game is seeded from --seed, so a run can be reproduced exactly.
+
+Usage:
+  python simulate.py [--games 1000] [--workers N] [--seed 1]
+                     [--wpm 40] [--error-rate 0.05] [--reaction 0.4]
+                     [--max-minutes 30] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import *
+from session import GameSession
+from rngstreams import seed_streams
+
+
+class BotTypist():
+    """Simulated player: types the label of the lowest target at a set speed.
+
+    wpm is converted to keystrokes per second (5 characters per word);
+    each keystroke is wrong with probability error_rate, and picking a new
+    target first costs the reaction time.
+    """
+    def __init__(self, rng, wpm = 40, error_rate = 0.05, reaction = 0.4):
+        self.rng = rng
+        self.key_interval = 60.0 / (wpm * 5)        # seconds per keystroke
+        self.error_rate = error_rate
+        self.reaction = reaction                    # seconds before typing a new target
+        self.target = None
+        self.serial = 0
+        self.word = ""
+        self.next_key_time = 0.0
+
+    def act(self, session):
+        """Type at most one key if it is time to; called once per step"""
+        now = session.clock.sim_time
+        if now < self.next_key_time:
+            return
+        if not self._target_alive():
+            if not self._pick_target(session):
+                return
+            self.next_key_time = now + self.reaction * self.rng.uniform(0.8, 1.2)
+            return
+
+        typed = session.typed_sequence
+        if not self.word.startswith(typed):
+            typed = ""                              # sequence was reset; start the word again
+        if self.rng.random() < self.error_rate:
+            ch = self.rng.choice(TOP_ROW_KEYS + HOME_ROW_KEYS + BOTTOM_ROW_KEYS)
+        else:
+            ch = self.word[len(typed)]
+        session.type_key(ch)
+        self.next_key_time = now + self.key_interval * self.rng.uniform(0.7, 1.3)
+        if session.typed_sequence == "" and ch == self.word[len(typed)] and len(typed) + 1 == len(self.word):
+            self.target = None                      # word completed
+
+    def _target_alive(self):
+        return self.target is not None and self.target.serial == self.serial and self.target.label
+
+    # pick the labelled target closest to the ground (powerups only when no missile is left)
+    def _pick_target(self, session):
+        self.target = None
+        candidates = [m for m in session.missile_list if m.label and m.prefix_tracked]
+        if candidates:
+            self.target = max(candidates, key=lambda m: m.pos[1])
+        else:
+            powerups = [p for p in session.powerup_list if p.label and p.prefix_tracked]
+            if powerups:
+                self.target = powerups[0]
+        if self.target is None:
+            return False
+        self.serial = self.target.serial
+        self.word = str(self.target.label).lower()
+        return True
+
+
+def play_game(args):
+    """Play one seeded game; returns a result dict (runs in a worker process)"""
+    seed, wpm, error_rate, reaction, max_minutes = args
+    random.seed(seed)
+    seed_streams(seed)
+    session = GameSession(0)
+    bot = BotTypist(random.Random(seed * 7919 + 1), wpm, error_rate, reaction)
+    level_times = {}                                # level -> game seconds it started at
+    level_times[session.get_level()] = 0.0
+    max_steps = int(max_minutes * 60 * FPS)
+    state = GAME_STATE_RUNNING
+    while session.frame < max_steps:
+        bot.act(session)
+        state = session.step()
+        if state == GAME_STATE_NEW_LEVEL:
+            session.start_next_level()
+            level_times[session.get_level()] = session.clock.sim_time
+        elif state == GAME_STATE_OVER:
+            break
+    return {
+        "seed": seed,
+        "level": session.get_level(),
+        "score": session.get_score(),
+        "seconds": round(session.clock.sim_time, 2),
+        "game_over": state == GAME_STATE_OVER,
+        "level_times": level_times,
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_report(results, elapsed, workers):
+    games = len(results)
+    levels = [r["level"] for r in results]
+    scores = [r["score"] for r in results]
+    print(f"\n{games} games in {elapsed:.1f}s on {workers} workers ({games / elapsed:.1f} games/s)")
+    print(f"Game over: {sum(r['game_over'] for r in results)}  Still alive at time limit: {sum(not r['game_over'] for r in results)}")
+
+    print("\nSurvival by level (games that reached it, median game time at its start):")
+    for level in range(1, max(levels) + 1):
+        reached = [r["level_times"][level] for r in results if level in r["level_times"]]
+        bar = "#" * int(40 * len(reached) / games)
+        print(f"  L{level:<3} {100.0 * len(reached) / games:6.1f}%  {percentile(reached, 0.5):7.1f}s  {bar}")
+
+    print("\nLevel reached:")
+    for level in sorted(set(levels)):
+        count = levels.count(level)
+        print(f"  L{level:<3} {count:6}  {'#' * int(40 * count / games)}")
+
+    print("\nScore:")
+    print(f"  mean {sum(scores) / games:.0f}  min {min(scores)}  max {max(scores)}")
+    print("  " + "  ".join(f"p{int(p * 100)} {percentile(scores, p)}" for p in (0.1, 0.25, 0.5, 0.75, 0.9)))
+    width = max(1, (max(scores) - min(scores)) // 10 + 1)
+    for start in range(min(scores), max(scores) + 1, width):
+        count = sum(start <= s < start + width for s in scores)
+        print(f"  {start:>7}-{start + width - 1:<7} {count:6}  {'#' * int(40 * count / games)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless KeyBlaster games with a simulated typist")
+    parser.add_argument("--games", type=int, default=1000, help="number of games (default 1000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=1, help="base seed; game i uses seed + i")
+    parser.add_argument("--wpm", type=float, default=40, help="typist speed in words per minute")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="chance each keystroke is wrong")
+    parser.add_argument("--reaction", type=float, default=0.4, help="seconds to react to a new target")
+    parser.add_argument("--max-minutes", type=float, default=30, help="game time limit per game")
+    parser.add_argument("--json", help="also write every game's result to this file")
+    options = parser.parse_args()
+    if options.games < 1:
+        parser.error("--games must be at least 1")
+    if options.workers is not None and options.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    jobs = [(options.seed + i, options.wpm, options.error_rate, options.reaction, options.max_minutes)
+            for i in range(options.games)]
+    workers = options.workers or 1                  # os.cpu_count() can be None
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(play_game, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+    elapsed = time.time() - started
+
+    print_report(results, elapsed, workers)
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {options.json}")
+
+
+if __name__ == '__main__':
+    main()
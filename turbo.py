@@ -0,0 +1,80 @@
+import time
+from collections import deque
+from config import *
+
+
+class TurboRunner():
+    """Advances a GameSession by one or more simulation steps per rendered frame.
+
+    In turbo the game runs up to TURBO_SPEED fixed timesteps per frame at
+    the normal display rate, stopping early when the frame's time budget is
+    spent, so turbo scales with CPU instead of being capped by rendering.
+    At normal speed a late frame is caught up with extra steps (at most
+    MAX_CATCHUP_STEPS; anything beyond is dropped and the game slows down),
+    so slow hardware can drop frames without changing gameplay.
+    The speed-up actually achieved (simulated time over wall time) is
+    measured over the last second.
+    """
+    def __init__(self, speed = TURBO_SPEED, budget = TURBO_FRAME_BUDGET):
+        self.speed = speed                          # target steps per rendered frame
+        self.budget = budget / FPS                  # seconds of stepping allowed per frame
+        self.history = deque()                      # (wall time, steps) for recent frames
+        self.steps = 0                              # steps in the history window
+        self.turbo = False                          # was the last frame in turbo
+        self.backlog = 0.0                          # steps owed (or run ahead) from earlier frames
+
+    def run(self, session, turbo, frame_time = None):
+        """Step the session for one rendered frame; returns the resulting game state
+
+        frame_time is the real time in seconds since the previous frame.
+        """
+        if turbo != self.turbo:
+            self.reset()                            # measure each turbo run on its own
+            self.turbo = turbo
+        if turbo:
+            target = self.speed
+            session.clock.set_speed(self.speed)
+        else:
+            target = self._catch_up(frame_time)
+            session.clock.set_speed(1)
+        started = time.perf_counter()
+        deadline = started + self.budget
+        steps = 0
+        while True:
+            state = session.step()
+            steps += 1
+            if state != GAME_STATE_RUNNING or steps >= target:
+                break
+            if turbo and time.perf_counter() >= deadline:
+                break
+
+        self.history.append((started, steps))
+        self.steps += steps
+        while len(self.history) > 1 and started - self.history[0][0] > 1.0:
+            self.steps -= self.history.popleft()[1]
+        return state
+
+    def get_speedup(self):
+        """Simulated time over wall time for the last second (1.0 = real time)"""
+        if len(self.history) < 2:
+            return 1.0
+        elapsed = self.history[-1][0] - self.history[0][0]
+        if elapsed <= 0:
+            return 1.0
+        # steps of the newest frame have not had their frame time elapse yet
+        return (self.steps - self.history[-1][1]) / FPS / elapsed
+
+    # normal-speed steps needed to keep up with real time this frame
+    def _catch_up(self, frame_time):
+        if frame_time is None or frame_time > MAX_FRAME_GAP:
+            self.backlog = 0.0                      # paused or first frame: nothing to catch up
+            return 1
+        owed = self.backlog + frame_time * FPS
+        steps = max(1, min(int(owed + 0.5), MAX_CATCHUP_STEPS))
+        self.backlog = max(-1.0, min(owed - steps, 1.0))
+        return steps
+
+    def reset(self):
+        self.history.clear()
+        self.steps = 0
+        self.backlog = 0.0
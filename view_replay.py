@@ -5,14 +5,17 @@ Replay Viewer for KeyBlaster Debug Replays
 Usage: 
   python view_replay.py <replay_file.json>     # Analyze specific replay
   python view_replay.py --list                 # List recent replays
+  python view_replay.py --reindex              # Rebuild the replay list (after deleting or copying in replays)
   python view_replay.py --latest               # Analyze most recent replay
+  python view_replay.py --export <replay.kbr>   # Convert a binary replay or journal to a .json replay
+  python view_replay.py <replay> --at 1834     # Show the game state 1834s in and the events after it
+  python view_replay.py <replay> --level 14    # Same, from where level 14 starts (--game N for a later game)
 """
 
 import sys
-import json
 import os
-import glob
-from replay import ReplayPlayer, get_replay_directory
+import collections
+from replay import ReplayPlayer, get_replay_directory, iter_replay, export_json, read_catalog, rebuild_catalog, latest_replay
 
 def format_event(event):
     """Format an event for display"""
@@ -46,191 +49,264 @@ def format_event(event):
         return f"{timestamp} {event_type} {event['data']}"
 
 def analyze_replay(filename):
-    """Analyze and display replay contents"""
-    player = ReplayPlayer(filename)
-    
-    if not player.load():
-        print(f"Failed to load replay: {filename}")
-        return
-    
+    """Analyze and display replay contents in one pass over the file
+
+    Events are printed as they are read and only running totals are kept,
+    so memory stays bounded however long the replay is; the summaries,
+    which need every event (or the summary trailer at the end of the
+    file), follow the event log.
+    """
     print("=" * 80)
     print(f"KEYBLASTER REPLAY ANALYSIS: {filename}")
     print("=" * 80)
+    print("EVENT LOG:")
+    print("=" * 80)
     
-    # Show AI debug info if available
+    event_types = {}
+    duration = 0
+    last_state = None
+    ai_debug = None
+    word_matching = WordMatchAnalysis()
+    
+    # Group events for better readability
+    current_second = -1
     try:
-        with open(filename, 'r') as f:
-            replay_data = json.load(f)
-            ai_debug = replay_data.get("ai_debug_info")
+        for kind, value in iter_replay(filename):
+            if kind == "summary":
+                ai_debug = value
+            if kind != "event":
+                continue
+            event = value
+            event_second = int(event['time'])
+            if event_second != current_second:
+                if current_second >= 0:
+                    print()  # Add blank line between seconds
+                current_second = event_second
+            
+            print(format_event(event))
             
-            if ai_debug:
-                print("AI DEBUG SUMMARY:")
-                print("=" * 80)
-                print(f"Session Duration: {ai_debug.get('session_duration', 0):.1f}s")
-                print(f"Total Keystrokes: {ai_debug.get('total_keystrokes', 0)}")
-                print(f"Keystroke Sequence: '{ai_debug.get('keystroke_sequence', '')}'")
-                print(f"Successful Matches: {ai_debug.get('successful_matches', [])}")
-                print(f"Failed Matches: {ai_debug.get('failed_matches', [])}")
-                print(f"Levels Reached: {ai_debug.get('levels_reached', [])}")
-                
-                issues = ai_debug.get('potential_issues', [])
-                if issues:
-                    print("\nPOTENTIAL ISSUES DETECTED:")
-                    for i, issue in enumerate(issues, 1):
-                        print(f"{i}. {issue}")
-                
-                final_state = ai_debug.get('final_game_state')
-                if final_state:
-                    print(f"\nFinal Game State:")
-                    print(f"  Level: {final_state.get('level', '?')}")
-                    print(f"  Score: {final_state.get('score', 0)}")
-                    print(f"  Typed Sequence: '{final_state.get('typed_sequence', '')}'")
-                    missiles = [m['label'] for m in final_state.get('missiles', [])]
-                    powerups = [p['label'] for p in final_state.get('powerups', [])]
-                    print(f"  Available Words: {missiles + powerups}")
-                
-                print("=" * 80)
-    except:
-        pass  # Continue with regular analysis if debug info fails
+            event_types[event['type']] = event_types.get(event['type'], 0) + 1
+            duration = event['time']
+            if event['type'] == 'game_state':
+                last_state = event['data']
+            word_matching.add(event)
+    except Exception as e:
+        print(f"Failed to load replay: {e}")
+        return
     
-    print(player.get_summary())
     print("=" * 80)
-    print("EVENT LOG:")
+    if not event_types:
+        print("No events loaded")
+    else:
+        print(f"Replay Duration: {duration:.2f}s")
+        print(f"Events:")
+        for event_type, count in sorted(event_types.items()):
+            print(f"  {event_type}: {count}")
     print("=" * 80)
     
-    # Group events for better readability
-    current_second = -1
-    for event in player.events:
-        event_second = int(event['time'])
-        if event_second != current_second:
-            if current_second >= 0:
-                print()  # Add blank line between seconds
-            current_second = event_second
-        
-        print(format_event(event))
+    if ai_debug is None and event_types:
+        # no summary trailer (the game didn't close the replay): what the running totals give
+        print("(No debug summary in this replay; the recording did not end normally.)")
+        ai_debug = {
+            "session_duration": duration,
+            "total_keystrokes": event_types.get('keypress', 0),
+            "final_game_state": last_state,
+        }
+    if ai_debug:
+        print_debug_summary(ai_debug)
     
-    print("=" * 80)
     print("END OF REPLAY")
     print("=" * 80)
+    word_matching.report()
 
-def analyze_word_matching_issues(filename):
-    """Analyze potential word matching problems"""
-    player = ReplayPlayer(filename)
+def print_debug_summary(ai_debug):
+    """Print a replay's AI debug summary"""
+    print("AI DEBUG SUMMARY:")
+    print("=" * 80)
+    print(f"Session Duration: {ai_debug.get('session_duration', 0):.1f}s")
+    print(f"Total Keystrokes: {ai_debug.get('total_keystrokes', 0)}")
+    for title, key in (("Keystroke Sequence", 'keystroke_sequence'), ("Successful Matches", 'successful_matches'),
+                       ("Failed Matches", 'failed_matches'), ("Levels Reached", 'levels_reached')):
+        if key in ai_debug:
+            value = ai_debug[key]
+            print(f"{title}: '{value}'" if isinstance(value, str) else f"{title}: {value}")
     
-    if not player.load():
-        return
+    issues = ai_debug.get('potential_issues', [])
+    if issues:
+        print("\nPOTENTIAL ISSUES DETECTED:")
+        for i, issue in enumerate(issues, 1):
+            print(f"{i}. {issue}")
+    
+    final_state = ai_debug.get('final_game_state')
+    if final_state:
+        print(f"\nFinal Game State:")
+        print(f"  Level: {final_state.get('level', '?')}")
+        print(f"  Score: {final_state.get('score', 0)}")
+        print(f"  Typed Sequence: '{final_state.get('typed_sequence', '')}'")
+        missiles = [m['label'] for m in final_state.get('missiles', [])]
+        powerups = [p['label'] for p in final_state.get('powerups', [])]
+        print(f"  Available Words: {missiles + powerups}")
     
-    print("\n" + "=" * 80)
-    print("WORD MATCHING ANALYSIS")
     print("=" * 80)
+
+class WordMatchAnalysis():
+    """Running state of the word matching check, updated one event at a time.
+
+    Typed letters not yet used by a matched word are kept as per-letter
+    counts (and the last BUFFER_TAIL of them as text, for display and for
+    finding matched words), and each available word keeps how many of its
+    letters are still missing from them. An event costs time for what it
+    changed, not for everything typed so far.
+    """
+    BUFFER_TAIL = 80                                # typed letters kept as text
     
-    # Track typing sequences that didn't result in matches
-    keystroke_buffer = ""
-    last_game_state = None
-    potential_issues = []
+    def __init__(self):
+        self.counts = {}                            # letter -> times in the buffer
+        self.length = 0                             # letters in the buffer
+        self.tail = ""                              # end of the buffer
+        self.words = []                             # available words in the last game state
+        self.letters = {}                           # letter -> indexes of the available words that use it
+        self.missing = []                           # per available word: its distinct letters not in the buffer
+        self.complete = 0                           # available words with no letter missing
+        self.have_state = False
+        self.issues = collections.deque(maxlen=5)   # only the last few are shown
     
-    for event in player.events:
+    def add(self, event):
         if event['type'] == 'keypress':
             char = event['data'].get('char', '')
             if char and char.isalpha():
-                keystroke_buffer += char.lower()
+                for letter in char.lower():
+                    self._add_letter(letter)
         
         elif event['type'] == 'game_state':
-            last_game_state = event['data']
+            self._set_words(event['data'])
         
         elif event['type'] == 'word_match':
             word = event['data']['word']
-            if word in keystroke_buffer:
+            i = self.tail.find(word)
+            if word and i >= 0:
                 # Remove matched word from buffer
-                keystroke_buffer = keystroke_buffer.replace(word, "", 1)
+                self.tail = self.tail[:i] + self.tail[i + len(word):]
+                for letter in word:
+                    self._remove_letter(letter)
         
         # Check for potential issues: long keystroke buffer with available words
-        if len(keystroke_buffer) > 3 and last_game_state:
-            available_words = []
-            for missile in last_game_state.get('missiles', []):
-                available_words.append(missile['label'])
-            for powerup in last_game_state.get('powerups', []):
-                available_words.append(powerup['label'])
-            
-            # Check if any available word could be formed from buffer
-            for word in available_words:
-                if all(char in keystroke_buffer for char in word.lower()):
-                    potential_issues.append({
-                        'time': event['time'],
-                        'buffer': keystroke_buffer,
-                        'missed_word': word,
-                        'available_words': available_words
-                    })
-                    break
+        if self.length > 3 and self.have_state and self.complete:
+            # first available word that could be formed from the buffer
+            word = next(w for w, missing in zip(self.words, self.missing) if missing == 0)
+            buffer = self.tail[-self.BUFFER_TAIL:]
+            self.issues.append({
+                'time': event['time'],
+                'buffer': buffer if len(buffer) == self.length else "..." + buffer,
+                'missed_word': word,
+                'available_words': list(self.words)
+            })
     
-    if potential_issues:
-        print("POTENTIAL WORD MATCHING ISSUES:")
-        for issue in potential_issues[-5:]:  # Show last 5 issues
-            print(f"Time {issue['time']:7.3f}s: Typed '{issue['buffer']}' but '{issue['missed_word']}' was available")
-            print(f"                Available words: {issue['available_words']}")
-    else:
-        print("No obvious word matching issues detected.")
+    def report(self):
+        print("\n" + "=" * 80)
+        print("WORD MATCHING ANALYSIS")
+        print("=" * 80)
+        if self.issues:
+            print("POTENTIAL WORD MATCHING ISSUES:")
+            for issue in self.issues:  # Show last 5 issues
+                print(f"Time {issue['time']:7.3f}s: Typed '{issue['buffer']}' but '{issue['missed_word']}' was available")
+                print(f"                Available words: {issue['available_words']}")
+        else:
+            print("No obvious word matching issues detected.")
+    
+    def _add_letter(self, letter):
+        count = self.counts.get(letter, 0)
+        self.counts[letter] = count + 1
+        self.length += 1
+        self.tail += letter
+        if len(self.tail) > 2 * self.BUFFER_TAIL:
+            self.tail = self.tail[-self.BUFFER_TAIL:]
+        if count == 0:
+            for i in self.letters.get(letter, ()):
+                self.missing[i] -= 1
+                if self.missing[i] == 0:
+                    self.complete += 1
+    
+    def _remove_letter(self, letter):
+        count = self.counts[letter] - 1
+        self.counts[letter] = count
+        self.length -= 1
+        if count == 0:
+            for i in self.letters.get(letter, ()):
+                if self.missing[i] == 0:
+                    self.complete -= 1
+                self.missing[i] += 1
+    
+    def _set_words(self, state):
+        self.have_state = bool(state)
+        self.words = [m['label'] for m in state.get('missiles', [])] + [p['label'] for p in state.get('powerups', [])]
+        self.letters = {}
+        self.missing = []
+        for i, word in enumerate(self.words):
+            distinct = set(word.lower())
+            for letter in distinct:
+                self.letters.setdefault(letter, []).append(i)
+            self.missing.append(sum(1 for letter in distinct if not self.counts.get(letter)))
+        self.complete = self.missing.count(0)
+
+def show_from(filename, seconds=None, level=None, game=0, count=40):
+    """Seek to a time or level and print the game state there and the next events"""
+    player = ReplayPlayer(filename)
+    state = player.seek(seconds=seconds, level=level, game=game)
+    target = f"{seconds}s" if seconds is not None else f"level {level} of game {game + 1}"
+    if player.next_event is None:
+        print(f"The replay does not reach {target}.")
+        return
+    print("=" * 80)
+    print(f"REPLAY AT {target.upper()}: {filename}")
+    print("=" * 80)
+    if state:
+        print(format_event({"time": player.next_event["time"], "type": "game_state", "data": state}))
+        print("-" * 80)
+    event = player.next_event
+    for _ in range(count):
+        if event is None:
+            break
+        print(format_event(event))
+        event = next(player.stream, None)
 
 def list_replays():
-    """List all available replay files"""
+    """List all available replay files (from the replay directory's catalog, newest first)"""
     replay_dir = get_replay_directory()
-    pattern = os.path.join(replay_dir, "replay_*.json")
-    replay_files = glob.glob(pattern)
+    entries = read_catalog(replay_dir)
     
-    if not replay_files:
+    if not entries:
         print(f"No replay files found in: {replay_dir}")
         return []
     
-    # Sort by modification time (newest first)
-    replay_files.sort(key=os.path.getmtime, reverse=True)
-    
     print(f"Replay files in: {replay_dir}")
     print("=" * 80)
     
-    for i, filepath in enumerate(replay_files):
-        filename = os.path.basename(filepath)
-        mod_time = os.path.getmtime(filepath)
-        size = os.path.getsize(filepath)
-        
-        from datetime import datetime
-        time_str = datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M:%S")
-        
-        print(f"{i+1:2d}. {filename}")
-        print(f"    Created: {time_str}  Size: {size:,} bytes")
-        
-        # Show brief summary
-        try:
-            player = ReplayPlayer(filepath)
-            if player.load():
-                event_count = len(player.events)
-                duration = player.events[-1]["time"] if player.events else 0
-                print(f"    Duration: {duration:.1f}s  Events: {event_count}")
-        except:
-            print("    [Could not read file]")
+    from datetime import datetime
+    for i, entry in enumerate(reversed(entries)):
+        time_str = datetime.fromtimestamp(entry["start_time"]).strftime("%Y-%m-%d %H:%M:%S")
         
+        print(f"{i+1:2d}. {entry['name']}")
+        print(f"    Created: {time_str}  Size: {entry['size']:,} bytes")
+        print(f"    Duration: {entry['duration']:.1f}s  Events: {entry['events']}  "
+              f"Final score: {entry['final_score']}  Highest level: {entry['max_level']}")
         print()
     
-    return replay_files
+    return [os.path.join(replay_dir, entry["name"]) for entry in reversed(entries)]
 
 def get_latest_replay():
     """Get the path to the most recent replay file"""
-    replay_dir = get_replay_directory()
-    pattern = os.path.join(replay_dir, "replay_*.json")
-    replay_files = glob.glob(pattern)
-    
-    if not replay_files:
-        return None
-    
-    # Return the most recently modified file
-    latest = max(replay_files, key=os.path.getmtime)
-    return latest
+    return latest_replay(get_replay_directory())
 
 def main():
     if len(sys.argv) < 2:
         print("Usage: python view_replay.py <replay_file.json|--list|--latest>")
         print("\nOptions:")
         print("  --list     List all available replay files")
+        print("  --reindex  Rebuild the replay catalog that --list reads")
         print("  --latest   Analyze the most recent replay file")
+        print("  --export   Convert a binary replay (.kbr) or journal (.jsonl) to a whole-file .json replay")
+        print("  filename --at SECONDS | --level N [--game N]   Show the replay from a point in it")
         print("  filename   Analyze specific replay file")
         return
     
@@ -239,6 +315,28 @@ def main():
     if arg == "--list":
         list_replays()
         return
+
+    elif arg == "--reindex":
+        replay_dir = get_replay_directory()
+        try:
+            entries = rebuild_catalog(replay_dir)
+        except (OSError, ValueError) as e:
+            print(f"Could not rebuild the replay catalog: {e}")
+            sys.exit(1)
+        print(f"Catalog rebuilt with {len(entries)} replays in: {replay_dir}")
+        return
+
+    elif arg == "--export":
+        if len(sys.argv) < 3:
+            print("Usage: python view_replay.py --export <replay_file.kbr|.jsonl>")
+            return
+        try:
+            output = export_json(sys.argv[2])
+        except (OSError, ValueError) as e:
+            print(f"Could not export {sys.argv[2]}: {e}")
+            sys.exit(1)
+        print(f"Replay exported to {output}")
+        return
     
     elif arg == "--latest":
         latest = get_latest_replay()
@@ -257,8 +355,28 @@ def main():
             if os.path.exists(full_path):
                 filename = full_path
     
+    options = sys.argv[2:]
+    if "--at" in options or "--level" in options:
+        def option(name, kind):
+            if name not in options:
+                return None
+            position = options.index(name) + 1
+            if position >= len(options):
+                raise ValueError(f"{name} needs a value")
+            return kind(options[position])
+        try:
+            seconds = option("--at", float)
+            level = option("--level", int)
+            game = option("--game", int)
+        except ValueError:
+            seconds = level = None                  # missing or not a number
+        if (seconds is None and level is None) or (game is not None and game < 1):
+            print("Usage: python view_replay.py <replay_file> --at SECONDS | --level N [--game N]")
+            return
+        show_from(filename, seconds=seconds, level=level, game=(game or 1) - 1)
+        return
+    
     analyze_replay(filename)
-    analyze_word_matching_issues(filename)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
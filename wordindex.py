@@ -0,0 +1,163 @@
+import mmap
+import struct
+from config import *
+from ergonomics import DifficultyIndex, word_difficulty
+
+# Compiled word index file layout (little-endian):
+#   header   magic, version, word count, bucket count, section offsets
+#   offsets  (word count + 1) x uint32 start of each word in the blob
+#   buckets  one record per (length, rows, prefix) group of consecutive words
+#   blob     all words as ASCII, sorted by (length, rows, prefix, word)
+#   scores   (difficulty score, word number) for every word, sorted by score
+INDEX_MAGIC = b'KBWI'
+INDEX_VERSION = 2
+HEADER = struct.Struct('<4sHHIIIIII')   # magic, version, reserved, words, buckets, offsets_at, buckets_at, blob_at, scores_at
+BUCKET = struct.Struct('<BB2sII')       # length, rows mask, prefix, first word, word count
+OFFSET = struct.Struct('<I')
+SCORE = struct.Struct('<fI')            # ergonomics difficulty score, word number
+
+# keyboard row bits for the rows mask
+ROW_TOP = 1
+ROW_HOME = 2
+ROW_BOTTOM = 4
+ALL_ROWS = ROW_TOP | ROW_HOME | ROW_BOTTOM
+_ROW_OF_KEY = {}
+for _row, _keys in ((ROW_TOP, TOP_ROW_KEYS), (ROW_HOME, HOME_ROW_KEYS), (ROW_BOTTOM, BOTTOM_ROW_KEYS)):
+    for _key in _keys:
+        _ROW_OF_KEY[_key] = _row
+
+
+def word_rows(word):
+    """Bit mask of the keyboard rows a word uses"""
+    rows = 0
+    for char in word:
+        rows |= _ROW_OF_KEY[char]
+    return rows
+
+
+def index_key(word):
+    return (len(word), word_rows(word), word[:2], word)
+
+
+def compile_word_index(words, filename):
+    """Write a compiled index for an iterable of words; returns (kept, skipped)"""
+    kept = set()
+    skipped = 0
+    for word in words:
+        word = word.strip().lower()
+        if not word:
+            continue
+        if len(word) > 255 or any(char not in _ROW_OF_KEY for char in word):
+            skipped += 1
+            continue
+        kept.add(word)
+    ordered = sorted(kept, key=index_key)
+
+    offsets = bytearray()
+    blob = bytearray()
+    buckets = []
+    for number, word in enumerate(ordered):
+        offsets += OFFSET.pack(len(blob))
+        blob += word.encode('ascii')
+        length, rows, prefix, _ = index_key(word)
+        if buckets and buckets[-1][:3] == [length, rows, prefix]:
+            buckets[-1][4] += 1
+        else:
+            buckets.append([length, rows, prefix, number, 1])
+    offsets += OFFSET.pack(len(blob))
+
+    # score every word once so spawning can look up difficulty bands
+    scores = sorted((SCORE.unpack(SCORE.pack(word_difficulty(word), number))
+                     for number, word in enumerate(ordered)))
+
+    offsets_at = HEADER.size
+    buckets_at = offsets_at + len(offsets)
+    blob_at = buckets_at + BUCKET.size * len(buckets)
+    scores_at = blob_at + len(blob)
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(ordered), len(buckets), offsets_at, buckets_at, blob_at, scores_at))
+        f.write(offsets)
+        for length, rows, prefix, start, count in buckets:
+            f.write(BUCKET.pack(length, rows, prefix.ljust(2).encode('ascii'), start, count))
+        f.write(blob)
+        for score, number in scores:
+            f.write(SCORE.pack(score, number))
+    return len(ordered), skipped
+
+
+class WordRange():
+    """Sequence view of consecutive words in a WordIndex (decoded on access)"""
+    def __init__(self, index, start, count):
+        self.index = index
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0 or i >= self.count:
+            raise IndexError(i)
+        return self.index.word(self.start + i)
+
+
+class ScoreColumn():
+    """Sequence view of the score-sorted section: scores or the words they belong to"""
+    def __init__(self, index, words):
+        self.index = index
+        self.words = words                          # True: yield words, False: yield scores
+
+    def __len__(self):
+        return self.index.word_count
+
+    def __getitem__(self, i):
+        if i < 0 or i >= self.index.word_count:
+            raise IndexError(i)
+        score, number = SCORE.unpack_from(self.index.data, self.index.scores_at + i * SCORE.size)
+        return self.index.word(number) if self.words else score
+
+
+class WordIndex():
+    """Read-only, memory-mapped compiled word index"""
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.word_count, self.bucket_count, self.offsets_at, self.buckets_at, self.blob_at, self.scores_at = HEADER.unpack_from(self.data, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Not a KeyBlaster word index (version {INDEX_VERSION}): {filename}")
+
+    def word(self, number):
+        start, end = struct.unpack_from('<II', self.data, self.offsets_at + number * OFFSET.size)
+        return self.data[self.blob_at + start:self.blob_at + end].decode('ascii')
+
+    def buckets(self):
+        """Yield (length, rows, prefix, start, count) for every bucket"""
+        for number in range(self.bucket_count):
+            length, rows, prefix, start, count = BUCKET.unpack_from(self.data, self.buckets_at + number * BUCKET.size)
+            yield length, rows, prefix.decode('ascii').rstrip(), start, count
+
+    def query(self, lengths, rows = ALL_ROWS):
+        """Group matching words by prefix: {prefix: [(WordRange, weight), ...]}
+
+        lengths is a list of (min length, max length, weight); only words
+        typed entirely on the keyboard rows in the rows mask are included.
+        """
+        groups = {}
+        for length, word_rows_mask, prefix, start, count in self.buckets():
+            if word_rows_mask & ~rows:
+                continue
+            for min_length, max_length, weight in lengths:
+                if min_length <= length <= max_length:
+                    groups.setdefault(prefix, []).append((WordRange(self, start, count), weight))
+                    break
+        return groups
+
+    def difficulty_index(self):
+        """DifficultyIndex reading the precomputed, score-sorted section in place"""
+        return DifficultyIndex(ScoreColumn(self, False), ScoreColumn(self, True))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
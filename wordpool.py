@@ -0,0 +1,283 @@
+import bisect
+import os
+import random
+from config import *
+from wordindex import WordIndex
+from ergonomics import DifficultyIndex
+
+# Word lists based on difficulty level with Gen Alpha shorthand
+# Home row biased 2-letter words (easy to type)
+TWO_LETTER_WORDS = ["as", "ad", "ah", "if", "is", "of", "go", "do", "so", "to", "at", "it", "up", "hi", "he", "ha", "fr", "np", "ig", "fs"]
+THREE_LETTER_WORDS = ["cat", "dog", "run", "car", "sun", "red", "big", "hot", "old", "new", "win", "try", "get", "hit", "riz", "sus", "mid", "lit", "cap", "fax", "bet", "ong", "idc", "lol", "imo", "ngl", "rip", "say", "bye", "omg"]
+FOUR_LETTER_WORDS = ["fire", "help", "jump", "fast", "slow", "cold", "blue", "dark", "long", "safe", "game", "time", "stop", "vibe", "flex", "slay", "yeet", "chad", "goat", "stan", "mood", "fomo", "simp", "cope", "edgy", "king", "giga", "poke"]
+FIVE_LETTER_WORDS = ["power", "laser", "blast", "storm", "quick", "magic", "space", "fight", "brave", "peace", "skill", "vibes", "based", "bruh", "sigma", "alpha", "ratio", "cringe", "queen", "chief", "slaps", "bussin", "lowkey", "highkey"]
+SIX_LETTER_WORDS = ["defend", "shield", "attack", "weapon", "strong", "danger", "flight", "battle", "energy", "launch", "locked", "salty", "savage", "clutch", "periodt", "whatev"]
+LONG_WORDS = ["missile", "defense", "protect", "freedom", "victory", "command", "destroy", "counter", "nuclear", "warfare", "periodt", "ghosted", "lowkey", "highkey", "cappin", "snatched", "pressed"]
+
+# RISKY words - intentionally difficult to type quickly
+# Mix of uncommon words, tricky spelling, and awkward finger combinations
+RISKY_WORDS = [
+    # Tricky finger combinations
+    "zyx", "qaz", "wsx", "xqz", "jkl", "mnb", "zxc",
+    # Challenging 4-5 letter words with difficult patterns
+    "lynx", "jinx", "quiz", "fizz", "fuzz", "jazz", "buzz", "whiz",
+    # Gen Alpha risky shorthand (tricky to type quickly)
+    "periodt", "whatev", "istg", "tbh", "irl", "rn", "nvm", "ttyl", "brb", "smh",
+    # 6-7 letter risky words
+    "zygote", "rhythm", "psycho", "sphinx", "fjords", "glyph", "nymph",
+    # Gen Alpha longer terms (risky because unfamiliar)
+    "snatched", "pressed", "cappin", "ghosted", "bussin", "slayed",
+    # 8+ letter high-risk words (long = more time vulnerable)
+    "xylophone", "zephyr", "syzygy", "byzantine", "schizoid", "rhapsody",
+    "labyrinth", "synchrony", "toxicity", "xerophyte"
+]
+
+# Progressive difficulty: (highest level, [(word list, weight), ...]); None = every later level
+WORD_TIERS = [
+    (3,    [(TWO_LETTER_WORDS, 1)]),                           # Level 3: only 2-letter words
+    (5,    [(TWO_LETTER_WORDS, 1), (THREE_LETTER_WORDS, 1)]),  # Levels 4-5: mix of 2 and 3 letter words
+    (7,    [(TWO_LETTER_WORDS, 1), (THREE_LETTER_WORDS, 3)]),  # Levels 6-7: mostly 3-letter, some 2-letter
+    (9,    [(THREE_LETTER_WORDS, 1), (FOUR_LETTER_WORDS, 1)]), # Levels 8-9: 3 and 4 letter words
+    (12,   [(FOUR_LETTER_WORDS, 1), (FIVE_LETTER_WORDS, 1)]),  # Levels 10-12: 4 and 5 letter words
+    (16,   [(FIVE_LETTER_WORDS, 1), (SIX_LETTER_WORDS, 1)]),   # Levels 13-16: 5 and 6 letter words
+    (None, [(SIX_LETTER_WORDS, 1), (LONG_WORDS, 1)]),          # Level 17+: 6+ letter words
+]
+
+
+# The same tiers as queries against a compiled word index: (highest level, [(min length, max length, weight), ...])
+INDEX_WORD_TIERS = [
+    (3,    [(2, 2, 1)]),
+    (5,    [(2, 2, 1), (3, 3, 1)]),
+    (7,    [(2, 2, 1), (3, 3, 3)]),
+    (9,    [(3, 3, 1), (4, 4, 1)]),
+    (12,   [(4, 4, 1), (5, 5, 1)]),
+    (16,   [(5, 5, 1), (6, 6, 1)]),
+    (None, [(6, 6, 1), (7, 255, 1)]),
+]
+
+
+def word_prefix(word):
+    """First 2 characters of a word, as used for on-screen conflict checks"""
+    return word[:2].lower()
+
+
+class PrefixSet(set):
+    """Prefixes of the words on screen.
+
+    WordPools that draw against this set register in pools and are told
+    about every prefix claimed or released, so they keep their free weight
+    current instead of rescanning the set on each draw.
+    """
+    def __init__(self, prefixes = ()):
+        super().__init__(prefixes)
+        self.pools = []                             # WordPools following this set
+
+    def add(self, prefix):
+        if prefix not in self:
+            super().add(prefix)
+            for pool in self.pools:
+                pool._block(prefix)
+
+    def discard(self, prefix):
+        if prefix in self:
+            super().discard(prefix)
+            for pool in self.pools:
+                pool._unblock(prefix)
+
+    def remove(self, prefix):
+        if prefix not in self:
+            raise KeyError(prefix)
+        self.discard(prefix)
+
+    def clear(self):
+        for prefix in list(self):
+            self.discard(prefix)
+
+
+class WordPool():
+    """Weighted word pool bucketed by 2-letter prefix.
+
+    Built once per difficulty tier. choose() draws a word whose prefix is
+    not on screen with the same weighting as picking uniformly from the
+    concatenated tier lists, without scanning the whole pool. The free
+    weight of each segment lives in a Fenwick tree that follows the
+    PrefixSet it draws against, so a draw costs O(log segments).
+    """
+    def __init__(self, buckets):
+        # buckets: prefix -> [(word sequence, weight), ...]
+        self.segments = []                          # (prefix, words, weight) in draw order
+        self.cumulative = []                        # running total weight at the end of each segment
+        self.bucket_weight = {}                     # prefix -> total weight of its words
+        self.bucket_segments = {}                   # prefix -> indexes of its segments
+        total = 0
+        for prefix, groups in buckets.items():
+            for words, weight in groups:
+                if not len(words) or weight <= 0:
+                    continue
+                total += len(words) * weight
+                self.bucket_segments.setdefault(prefix, []).append(len(self.segments))
+                self.segments.append((prefix, words, weight))
+                self.cumulative.append(total)
+                self.bucket_weight[prefix] = self.bucket_weight.get(prefix, 0) + len(words) * weight
+        self.total = total
+
+        self.active = None                          # PrefixSet the free weights follow
+        self.blocked = set()                        # prefixes of this pool currently on screen
+        self.available = total                      # weight of the segments not blocked
+        self.tree = [0] * (len(self.segments) + 1)  # Fenwick tree of free segment weights (1-based)
+        self.top_bit = 1 << (len(self.segments).bit_length() - 1) if self.segments else 0
+        self._rebuild()
+
+    @classmethod
+    def from_lists(cls, weighted_lists):
+        """Pool over in-memory word lists: [(words, weight), ...]"""
+        buckets = {}
+        for words, weight in weighted_lists:
+            grouped = {}
+            for word in words:
+                grouped.setdefault(word_prefix(word), []).append(word)
+            for prefix, group in grouped.items():
+                buckets.setdefault(prefix, []).append((group, weight))
+        return cls(buckets)
+
+    def choose(self, active_prefixes = (), rng = random):
+        """Pick a conflict-free word, or any word if every prefix is taken"""
+        if not active_prefixes:
+            return self._draw(rng.randrange(self.total))
+
+        if active_prefixes is not self.active:
+            self._follow(active_prefixes)
+        available = self.available
+        if available <= 0:
+            return self._draw(rng.randrange(self.total))  # Last resort
+
+        # mostly free: rejection sampling needs fewer than two draws on average
+        if available * 2 >= self.total:
+            while True:
+                word = self._draw(rng.randrange(self.total))
+                if word_prefix(word) not in active_prefixes:
+                    return word
+
+        # mostly blocked: weighted draw over the free segments only
+        segment, offset = self._find(rng.randrange(available))
+        _, words, weight = self.segments[segment]
+        return words[offset // weight]
+
+    # map a weighted position to a word
+    def _draw(self, pick):
+        segment = bisect.bisect_right(self.cumulative, pick)
+        _, words, weight = self.segments[segment]
+        start = self.cumulative[segment - 1] if segment else 0
+        return words[(pick - start) // weight]
+
+    # --- free weight bookkeeping
+
+    def _follow(self, active_prefixes):
+        """Track a new set of on-screen prefixes (plain sets are copied once per call)"""
+        if self.active is not None:
+            self.active.pools.remove(self)
+            self.active = None
+        if isinstance(active_prefixes, PrefixSet):
+            self.active = active_prefixes
+            active_prefixes.pools.append(self)
+        self.blocked = {prefix for prefix in active_prefixes if prefix in self.bucket_segments}
+        self._rebuild()
+
+    def _rebuild(self):
+        tree = [0] * (len(self.segments) + 1)
+        available = 0
+        for number, (prefix, words, weight) in enumerate(self.segments, 1):
+            if prefix not in self.blocked:
+                tree[number] += len(words) * weight
+                available += len(words) * weight
+            parent = number + (number & -number)
+            if parent < len(tree):
+                tree[parent] += tree[number]
+        self.tree = tree
+        self.available = available
+
+    def _adjust(self, prefix, sign):
+        for segment in self.bucket_segments[prefix]:
+            _, words, weight = self.segments[segment]
+            delta = sign * len(words) * weight
+            self.available += delta
+            number = segment + 1
+            while number < len(self.tree):
+                self.tree[number] += delta
+                number += number & -number
+
+    def _block(self, prefix):
+        if prefix in self.bucket_segments and prefix not in self.blocked:
+            self.blocked.add(prefix)
+            self._adjust(prefix, -1)
+
+    def _unblock(self, prefix):
+        if prefix in self.blocked:
+            self.blocked.discard(prefix)
+            self._adjust(prefix, 1)
+
+    def _find(self, pick):
+        """Free segment holding weighted position pick, and the offset into it"""
+        position = 0
+        step = self.top_bit
+        while step:
+            number = position + step
+            if number < len(self.tree) and self.tree[number] <= pick:
+                position = number
+                pick -= self.tree[number]
+            step >>= 1
+        return position, pick
+
+
+_TIER_POOLS = {}
+_RISKY_POOL = None
+_WORD_INDEX = None
+_DIFFICULTY_INDEX = None
+
+def get_word_index():
+    """Compiled word index from WORD_INDEX_FILE, or None to use the built-in lists"""
+    global _WORD_INDEX
+    if _WORD_INDEX is None:
+        _WORD_INDEX = False
+        if WORD_INDEX_FILE and os.path.exists(WORD_INDEX_FILE):
+            try:
+                _WORD_INDEX = WordIndex(WORD_INDEX_FILE)
+            except Exception as e:
+                print(f"Could not load word index {WORD_INDEX_FILE}: {e}")
+    return _WORD_INDEX or None
+
+def get_tier_pool(difficulty):
+    """Word pool for a difficulty level (built on first use)"""
+    index = get_word_index()
+    tiers = INDEX_WORD_TIERS if index else WORD_TIERS
+    for number, (max_level, tier) in enumerate(tiers):
+        if max_level is None or difficulty <= max_level:
+            pool = _TIER_POOLS.get(number)
+            if pool is None:
+                pool = WordPool(index.query(tier)) if index else WordPool.from_lists(tier)
+                if pool.total == 0:
+                    pool = WordPool.from_lists(WORD_TIERS[number][1])  # index has no words for this tier
+                _TIER_POOLS[number] = pool
+            return pool
+
+def get_difficulty_index():
+    """Words sorted by ergonomics difficulty (precomputed in the word index, else scored once here)"""
+    global _DIFFICULTY_INDEX
+    if _DIFFICULTY_INDEX is None:
+        index = get_word_index()
+        if index:
+            _DIFFICULTY_INDEX = index.difficulty_index()
+        else:
+            words = []
+            for _, tier in WORD_TIERS:
+                for word_list, _ in tier:
+                    words.extend(word_list)
+            _DIFFICULTY_INDEX = DifficultyIndex.from_words(words)
+    return _DIFFICULTY_INDEX
+
+def get_risky_pool():
+    """Word pool for powerups (built on first use)"""
+    global _RISKY_POOL
+    if _RISKY_POOL is None:
+        _RISKY_POOL = WordPool.from_lists([(RISKY_WORDS, 1)])
+    return _RISKY_POOL